@@ -1,14 +1,15 @@
 # %%[markdown]
 # # 製薬業界分析プロジェクト - メインエントリーポイント
 # 
-# このスクリプトは、srcディレクトリ内の分析スクリプトを順番に実行するにゃー。
+# このスクリプトは、srcディレクトリ内の分析スクリプトを別プロセスで実行するにゃー。
+# 各分析は互いに独立しているため、通常は並列に実行する。
 # 
 # ## 実行方法
 # 
 # ### 1. コマンドラインでの実行
 # ```bash
-# python main.py                    # 全スクリプトを実行
-# python main.py --stop-on-error    # エラー時に停止
+# python main.py                    # 全スクリプトを並列実行
+# python main.py --stop-on-error    # 番号順に実行し、エラー時に停止
 # python main.py --script 1         # スクリプト1のみ実行
 # ```
 # 
@@ -27,23 +28,68 @@
 
 # %%
 # インポートとプロジェクト設定
+import os
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import time
-import traceback
 
 # プロジェクトルートの設定
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# 各分析スクリプトが共通で読み込む入力データ
+DATA_PATH = PROJECT_ROOT / "input" / "財務データ_製薬業界.xlsx"
+
+# %%
+# 入力データの事前読み込み関数
+
+
+def preload_input_data(data_path: Path = DATA_PATH) -> None:
+    """
+    分析スクリプトの実行前に入力データを1回だけ読み込む
+    
+    modules.io.load_financial_xlsx のParquetキャッシュと、分析③・④共通の
+    前処理済みデータのキャッシュ（modules.preprocess.prepare_financial_data）を
+    作成しておくことで、並列に起動した各スクリプトがExcelの解析や前処理を
+    個別に行わず、キャッシュから読み込めるようにする。
+    
+    副作用：.cache/ 以下にキャッシュファイルを作成する
+    
+    Parameters
+    ----------
+    data_path : Path, default DATA_PATH
+        入力データ（Excel）のパス
+    """
+    from modules import preprocess
+    
+    start_time = time.time()
+    
+    try:
+        # 前処理の中でExcelの読み込み（io.load_financial_xlsx）も行われる
+        df = preprocess.prepare_financial_data(str(data_path))
+    except Exception as e:
+        # 事前読み込みは高速化のためだけに行うので、ファイルがない場合に限らず
+        # 読み込み・前処理・キャッシュ作成のどこで失敗しても各スクリプトは実行し、
+        # エラーはそれぞれで報告させる
+        print(f"入力データを事前に読み込めなかったにゃー: {type(e).__name__}: {e}")
+        return
+    
+    elapsed_time = time.time() - start_time
+    print(f"入力データを読み込んだにゃー: {df.shape}（所要時間: {elapsed_time:.2f}秒）")
+
 # %%
 # 個別スクリプト実行関数
 
 
 def run_script(script_path: Path, script_name: str) -> bool:
     """
-    指定されたPythonスクリプトを実行する
+    指定されたPythonスクリプトを別プロセスで実行する
+    
+    スクリプトの標準出力・標準エラーは子プロセスの終了後にまとめて表示する。
+    （並列実行時に各スクリプトのログが混ざらないようにするため）
     
     Parameters
     ----------
@@ -57,56 +103,61 @@ def run_script(script_path: Path, script_name: str) -> bool:
     bool
         実行が成功したかどうか
     """
-    print(f"\n{'='*60}")
     print(f"{script_name} の実行を開始するにゃー")
-    print(f"{'='*60}")
     
     start_time = time.time()
     
-    try:
-        # スクリプトの内容を読み込んで実行
-        with open(script_path, 'r', encoding='utf-8') as f:
-            script_content = f.read()
-        
-        # セルマーカー（# %%）を削除してから実行
-        # これによりインタラクティブ環境でもコマンドラインでも動作する
-        script_content_cleaned = script_content.replace('# %%[markdown]', '')
-        script_content_cleaned = script_content_cleaned.replace('# %%', '')
-        
-        # グローバル名前空間を使って実行（各スクリプトが独立して動作）
-        exec_globals = {
-            '__file__': str(script_path),
-            '__name__': '__main__',
-        }
-        
-        exec(script_content_cleaned, exec_globals)
-        
-        elapsed_time = time.time() - start_time
+    # 子プロセスの出力をUTF-8に固定する（Windowsでも日本語ログを正しく受け取るため）
+    env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+    
+    # 別プロセスで実行（各スクリプトは独立したインタプリタ・名前空間で動作する）
+    # セルマーカー（# %%）は通常のコメントとして扱われるため、そのまま実行できる
+    result = subprocess.run(
+        [sys.executable, str(script_path)],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    
+    elapsed_time = time.time() - start_time
+    
+    print(f"\n{'='*60}")
+    print(f"{script_name} の出力")
+    print(f"{'='*60}")
+    if result.stdout:
+        print(result.stdout, end="")
+    
+    if result.returncode == 0:
+        if result.stderr:
+            print(result.stderr, end="", file=sys.stderr)
         print(f"\n{script_name} の実行が完了したにゃー（所要時間: {elapsed_time:.2f}秒）")
         return True
-        
-    except Exception as e:
-        elapsed_time = time.time() - start_time
-        print(f"\n {script_name} の実行中にエラーが発生したにゃー（所要時間: {elapsed_time:.2f}秒）")
-        print(f"エラー内容: {str(e)}")
-        print("\n詳細なトレースバック:")
+    
+    print(f"\n {script_name} の実行中にエラーが発生したにゃー（所要時間: {elapsed_time:.2f}秒）")
+    print(f"終了コード: {result.returncode}")
+    print("\n詳細なトレースバック:")
+    print(result.stderr, end="")
+    return False
+
 # %%
 # 全分析実行関数
 
-        traceback.print_exc()
-        return False
-
 
 def run_all_analyses(stop_on_error: bool = False) -> None:
     """
-    全ての分析スクリプトを順番に実行する
+    全ての分析スクリプトを実行する
+    
+    各分析は互いに独立しているため、通常は別プロセスで並列に実行する。
     
     Parameters
     ----------
     stop_on_error : bool, default=False
         エラーが発生した場合に実行を停止するかどうか
-        False: エラーが発生しても次のスクリプトを実行
-        True: エラーが発生したら即座に停止
+        False: 全スクリプトを並列に実行し、エラーが発生しても他のスクリプトは継続
+        True: 番号順に1つずつ実行し、エラーが発生したら即座に停止
     """
     # 実行するスクリプトのリスト
     scripts = [
@@ -120,30 +171,59 @@ def run_all_analyses(stop_on_error: bool = False) -> None:
     print("製薬業界分析プロジェクトを開始するにゃー")
     print("="*60)
     print(f"実行対象: {len(scripts)}個のスクリプト")
+    print(f"実行方式: {'逐次実行' if stop_on_error else '並列実行'}")
     print(f"エラー時の動作: {'停止する' if stop_on_error else '継続する'}")
     print("="*60)
     
     src_dir = PROJECT_ROOT / "src"
-    results = []
+    # 実行順序に関わらずサマリーを番号順に表示するため、番号をキーにして結果を保持する
+    results: Dict[int, Tuple[str, bool]] = {}
     
     total_start_time = time.time()
     
-    for i, (script_file, script_name) in enumerate(scripts, 1):
-        script_path = src_dir / script_file
-        
-        if not script_path.exists():
-            print(f"\n{script_file} が見つからないにゃー: {script_path}")
-            results.append((script_name, False))
-            if stop_on_error:
+    # 入力データを1回だけ解析し、各スクリプトはキャッシュから読み込む
+    preload_input_data()
+    
+    if stop_on_error:
+        # 番号順に1つずつ実行し、エラーが発生した時点で中断する
+        for i, (script_file, script_name) in enumerate(scripts, 1):
+            script_path = src_dir / script_file
+            
+            if not script_path.exists():
+                print(f"\n{script_file} が見つからないにゃー: {script_path}")
+                results[i] = (script_name, False)
                 break
-            continue
-        
-        success = run_script(script_path, f"[{i}/{len(scripts)}] {script_name}")
-        results.append((script_name, success))
+            
+            success = run_script(script_path, f"[{i}/{len(scripts)}] {script_name}")
+            results[i] = (script_name, success)
+            
+            if not success:
+                print("\nエラーが発生したため、実行を中断するにゃー")
+                break
+    else:
+        # 存在するスクリプトのみを並列実行の対象にする
+        targets: List[Tuple[int, Path, str]] = []
+        for i, (script_file, script_name) in enumerate(scripts, 1):
+            script_path = src_dir / script_file
+            
+            if not script_path.exists():
+                print(f"\n{script_file} が見つからないにゃー: {script_path}")
+                results[i] = (script_name, False)
+                continue
+            
+            targets.append((i, script_path, script_name))
         
-        if not success and stop_on_error:
-            print("\nエラーが発生したため、実行を中断するにゃー")
-            break
+        # 実処理は子プロセスで行うため、完了待ちにはスレッドで十分
+        with ThreadPoolExecutor(max_workers=max(len(targets), 1)) as executor:
+            futures = {
+                executor.submit(
+                    run_script, script_path, f"[{i}/{len(scripts)}] {script_name}"
+                ): (i, script_name)
+                for i, script_path, script_name in targets
+            }
+            for future in as_completed(futures):
+                i, script_name = futures[future]
+                results[i] = (script_name, future.result())
     
     # 実行結果のサマリー
     total_elapsed_time = time.time() - total_start_time
@@ -151,18 +231,19 @@ def run_all_analyses(stop_on_error: bool = False) -> None:
     print("実行結果サマリー")
     print("="*60)
     
-    success_count = sum(1 for _, success in results if success)
-    for script_name, success in results:
+    success_count = sum(1 for _, success in results.values() if success)
+    for i in sorted(results):
+        script_name, success = results[i]
         status = "成功" if success else "失敗"
         print(f"{status}: {script_name}")
     
     print(f"\n成功: {success_count}/{len(results)}")
-# %%
-# 個別分析実行関数
-
     print(f"総所要時間: {total_elapsed_time:.2f}秒")
     print("="*60)
 
+# %%
+# 個別分析実行関数
+
 
 def run_single_analysis(script_number: int) -> None:
     """
@@ -203,9 +284,9 @@ def main() -> None:
     メイン関数
     
     コマンドライン引数に応じて実行モードを切り替える:
-    - 引数なし: 全スクリプトを順番に実行
+    - 引数なし: 全スクリプトを並列に実行
     - --script N: 指定された番号（1-4）のスクリプトのみ実行
-    - --stop-on-error: エラー時に実行を停止
+    - --stop-on-error: 番号順に実行し、エラー時に実行を停止
     """
     import argparse
     
@@ -214,8 +295,8 @@ def main() -> None:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 使用例:
-  python main.py                    # 全スクリプトを実行
-  python main.py --stop-on-error    # エラー時に停止
+  python main.py                    # 全スクリプトを並列実行
+  python main.py --stop-on-error    # 番号順に実行し、エラー時に停止
   python main.py --script 1         # スクリプト1のみ実行
   python main.py --script 3         # スクリプト3のみ実行
         """
@@ -231,7 +312,7 @@ def main() -> None:
     parser.add_argument(
         '--stop-on-error',
         action='store_true',
-        help='エラー発生時に実行を停止する'
+        help='番号順に実行し、エラー発生時に実行を停止する'
     )
     
     args = parser.parse_args()
@@ -2,33 +2,67 @@
 データの入出力を担当するモジュール
 
 主な機能：
-- Excel形式の財務データの読み込み
+- Excel形式の財務データの読み込み（Parquetキャッシュ付き）
 - 列名の正規化
 - テーブルデータの保存
 - 出力ディレクトリの確認・作成
 """
 
+import hashlib
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
 
+import openpyxl
 import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 
+# pyexcelerateは任意の依存パッケージ（インストールされていない場合はopenpyxlで保存する）
+try:
+    import pyexcelerate
+except ImportError:
+    pyexcelerate = None
 
-def load_financial_xlsx(path: str) -> pd.DataFrame:
+# 読み込み結果のキャッシュ保存先（プロジェクトルート直下）
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+# CSV保存時の書き込みバッファサイズ（バイト）と、一度に書き出す行数
+_WRITE_BUFFER_SIZE = 1 << 20
+_CSV_CHUNKSIZE = 65536
+
+
+def load_financial_xlsx(
+    path: str,
+    use_cache: bool = True,
+    usecols: Optional[List[str]] = None,
+) -> pd.DataFrame:
     """
     Excel形式の財務データを読み込む
     
-    列名の正規化（全角/半角統一、空白除去など）を行う
+    列名の正規化（全角/半角統一、空白除去など）を行う。
+    
+    Excelの解析は遅いため、読み込み結果を CACHE_DIR にParquet形式で保存し、
+    2回目以降はそちらから読み込む。キャッシュはファイルの更新時刻とサイズを
+    キーにしているため、Excelファイルを更新すると自動的に読み直される。
     
     Parameters
     ----------
     path : str
         読み込むExcelファイルのパス
+    use_cache : bool, default True
+        Parquetキャッシュを利用するかどうか
+    usecols : List[str], optional
+        読み込む列名のリスト（正規化後の列名で指定、Noneの場合は全列）
+        列の順序はExcel上の順序のままで、存在しない列は無視される
+        （必須列の確認はpreprocess.validate_columnsで行う）。
+        キャッシュを利用しない場合は、指定外の列をExcelの解析時点で読み飛ばす
     
     Returns
     -------
     pd.DataFrame
-        読み込んだデータフレーム（列名正規化済み）
+        読み込んだデータフレーム（列名正規化済み、PyArrowバックエンドの型）
     
     Raises
     ------
@@ -39,16 +73,220 @@ def load_financial_xlsx(path: str) -> pd.DataFrame:
     if not file_path.exists():
         raise FileNotFoundError(f"ファイルが見つかりません: {path}")
     
+    if not use_cache:
+        return _read_financial_xlsx(file_path, usecols)
+    
+    stat = file_path.stat()
+    
+    # キャッシュには全列を保存し（他のスクリプトと共有するため）、列の選択は読み込み後に行う
+    df = _load_with_cache(str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if usecols is not None:
+        wanted = set(usecols)
+        df = df[[col for col in df.columns if col in wanted]]
+    
+    # 同一プロセス内のキャッシュを共有するため、呼び出し側にはコピーを返す
+    return df.copy()
+
+
+@lru_cache(maxsize=4)
+def _load_with_cache(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Parquetキャッシュを経由してExcelファイルを読み込む
+    
+    引数に更新時刻とサイズを含めることで、プロセス内のメモ化（lru_cache）と
+    ディスク上のキャッシュの両方が、ファイル更新時に自動的に無効化される。
+    
+    Parameters
+    ----------
+    path : str
+        読み込むExcelファイルの絶対パス
+    mtime_ns : int
+        ファイルの更新時刻（ナノ秒）
+    size : int
+        ファイルサイズ（バイト）
+    
+    Returns
+    -------
+    pd.DataFrame
+        読み込んだデータフレーム（列名正規化済み）
+    """
+    file_path = Path(path)
+    cache_prefix = cache_file_prefix(file_path)
+    cache_path = CACHE_DIR / f"{cache_prefix}.{mtime_ns}.{size}.parquet"
+    
+    if cache_path.exists():
+        # 読み込めないキャッシュ（破損など）はExcelから読み直して作り直す
+        try:
+            return pd.read_parquet(cache_path, dtype_backend="pyarrow")
+        except (OSError, ValueError) as e:
+            print(f"警告: キャッシュを読み込めなかったため、Excelから読み直します: {e}")
+    
+    df = _read_financial_xlsx(file_path)
+    
+    # キャッシュの保存に失敗しても読み込み結果はそのまま返す
+    # （型が混在する列などはParquetに変換できない場合がある）
+    # 複数のスクリプトを同時に実行しても書き込み途中のファイルを読まないよう、
+    # 一時ファイルに書き出してから置き換える
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        ensure_output_dir(str(CACHE_DIR))
+        # 同じファイルの古いキャッシュは不要なので削除する
+        for old_cache in CACHE_DIR.glob(f"{cache_prefix}.*.parquet"):
+            if old_cache != cache_path:
+                old_cache.unlink(missing_ok=True)
+        df.to_parquet(tmp_path, engine="pyarrow", compression="snappy")
+        os.replace(tmp_path, cache_path)
+    except (ImportError, TypeError, ValueError, OSError) as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"警告: キャッシュを保存できませんでした: {e}")
+    
+    return df
+
+
+def cache_file_prefix(file_path: Path) -> str:
+    """
+    入力ファイルに対応するキャッシュファイル名の接頭辞を返す
+    
+    ファイル名だけでなく、ファイルがあるディレクトリの絶対パスの短いハッシュも含める。
+    （別のディレクトリにある同名のファイルが、互いのキャッシュを古いものとして削除しないため）
+    
+    Parameters
+    ----------
+    file_path : Path
+        入力ファイルのパス
+    
+    Returns
+    -------
+    str
+        キャッシュファイル名の接頭辞（「ファイル名（拡張子なし）.ハッシュ」）
+    """
+    parent = str(Path(file_path).resolve().parent)
+    parent_hash = hashlib.sha1(parent.encode("utf-8")).hexdigest()[:8]
+    return f"{Path(file_path).stem}.{parent_hash}"
+
+
+def _read_financial_xlsx(
+    file_path: Path,
+    usecols: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Excelファイルを読み込み、列名を正規化する
+    
+    Parameters
+    ----------
+    file_path : Path
+        読み込むExcelファイルのパス
+    usecols : List[str], optional
+        読み込む列名のリスト（正規化後の列名で指定、Noneの場合は全列）
+    
+    Returns
+    -------
+    pd.DataFrame
+        読み込んだデータフレーム（列名正規化済み）
+    """
+    # 列を指定した場合は、Excel上の列名を正規化してから判定する
+    read_usecols = None
+    if usecols is not None:
+        wanted = set(usecols)
+        
+        def read_usecols(name: object) -> bool:
+            return _normalize_column_name(name) in wanted
+    
     # Excelファイル読み込み
-    df = pd.read_excel(path)
+    # Rust実装のcalamineエンジン（python-calamine）が使える場合はそちらで高速に解析し、
+    # インストールされていない場合はopenpyxlの読み取り専用モードで読み込む
+    try:
+        df = pd.read_excel(file_path, engine="calamine", usecols=read_usecols)
+    except ImportError:
+        df = _read_xlsx_openpyxl(file_path, read_usecols)
     
     # 列名の正規化
-    df.columns = df.columns.str.strip()  # 前後の空白除去
-    df.columns = df.columns.str.replace("　", " ")  # 全角スペースを半角に
+    df.columns = [_normalize_column_name(col) for col in df.columns]
+    
+    # PyArrowバックエンドの型に変換する（文字列列がPythonオブジェクトの配列にならず、
+    # 集計もArrowのC++実装で行われる）
+    # 数値列もNumPyの型には戻さない。NumPy配列が必要な処理（外れ値判定のNumba実装など）は、
+    # 各関数内でto_numpy(dtype=np.float64, na_value=np.nan)により変換してから計算する
+    # （NumPyの型であることを前提にした分岐は置かない。各サマリーの列のデータ型もArrowの型名になる）
+    df = df.convert_dtypes(dtype_backend="pyarrow")
     
     return df
 
 
+def _read_xlsx_openpyxl(
+    file_path: Path,
+    usecols: Optional[Callable[[object], bool]] = None,
+) -> pd.DataFrame:
+    """
+    openpyxlの読み取り専用モードで先頭シートを読み込む
+    
+    セルを1つずつ参照せず、iter_rows(values_only=True)で行ごとに値のタプルを
+    取り出すため、pd.read_excel(engine="openpyxl")のセル単位の変換処理を経由しない。
+    1行目を列名とし、末尾の空行・空列を除く（pd.read_excelと同じ扱い）。
+    
+    Parameters
+    ----------
+    file_path : Path
+        読み込むExcelファイルのパス
+    usecols : Callable[[object], bool], optional
+        Excel上の列名を受け取り、読み込む列かどうかを返す関数（Noneの場合は全列）
+    
+    Returns
+    -------
+    pd.DataFrame
+        読み込んだデータフレーム
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        # 副作用：読み取り専用モードではファイルを開いたままになるため明示的に閉じる
+        workbook.close()
+    
+    if not rows:
+        return pd.DataFrame()
+    
+    header, records = rows[0], rows[1:]
+    
+    # 末尾の空行・空列は除く（途中の空行は欠損値の行として残す）
+    while records and all(value is None for value in records[-1]):
+        records.pop()
+    
+    n_cols = len(header)
+    while n_cols > 0 and all(row[n_cols - 1] is None for row in (header, *records)):
+        n_cols -= 1
+    
+    columns = [
+        f"Unnamed: {i}" if name is None else name
+        for i, name in enumerate(header[:n_cols])
+    ]
+    df = pd.DataFrame.from_records(
+        [row[:n_cols] for row in records], columns=columns
+    )
+    
+    if usecols is not None:
+        df = df[[col for col in df.columns if usecols(col)]]
+    
+    return df
+
+
+def _normalize_column_name(name: object) -> str:
+    """
+    列名を正規化する（前後の空白を除去し、全角スペースを半角に統一する）
+    
+    Parameters
+    ----------
+    name : object
+        Excel上の列名
+    
+    Returns
+    -------
+    str
+        正規化した列名
+    """
+    return str(name).strip().replace("　", " ")
+
+
 def save_table(
     df: pd.DataFrame,
     path: str,
@@ -78,7 +316,20 @@ def save_table(
     
     # 拡張子に応じて保存
     if file_path.suffix == ".csv":
-        df.to_csv(path, index=index, encoding="utf-8-sig", **kwargs)
+        # 大きめのバッファでファイルを開き、書き込みのシステムコール回数を減らす
+        # 改行コードはOSによらずLFに統一する（kwargsで上書き可能）
+        kwargs.setdefault("lineterminator", "\n")
+        kwargs.setdefault("chunksize", _CSV_CHUNKSIZE)
+        with open(
+            file_path,
+            "w",
+            encoding="utf-8-sig",
+            newline="",
+            buffering=_WRITE_BUFFER_SIZE,
+        ) as f:
+            df.to_csv(f, index=index, **kwargs)
+    elif file_path.suffix == ".xlsx" and set(kwargs) <= {"sheet_name"}:
+        _write_xlsx_fast(df, file_path, index=index, **kwargs)
     elif file_path.suffix in [".xlsx", ".xls"]:
         df.to_excel(path, index=index, **kwargs)
     else:
@@ -87,6 +338,65 @@ def save_table(
     print(f"ファイルを保存しました: {path}")
 
 
+def _write_xlsx_fast(
+    df: pd.DataFrame,
+    file_path: Path,
+    index: bool = False,
+    sheet_name: str = "Sheet1"
+) -> None:
+    """
+    書式設定を行わずにデータフレームをxlsxに保存する
+    
+    pyexcelerateがインストールされている場合は、値のみのシートとして一括で書き出す。
+    インストールされていない場合はopenpyxlの書き込み専用モードで行単位で追記する。
+    いずれもヘッダー行を太字にする以外はセルの書式設定を行わないため、
+    DataFrame.to_excelより高速。（ヘッダー行の罫線・中央揃えは付かない）
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        保存するデータフレーム
+    file_path : Path
+        保存先のファイルパス
+    index : bool, default False
+        インデックスを含めるかどうか
+    sheet_name : str, default "Sheet1"
+        シート名
+    """
+    # 欠損値は空セルにする（to_excelと同じ扱い）
+    df_values = df.astype(object).where(df.notna(), None)
+    
+    header = list(df.columns)
+    if index:
+        header = [df.index.name] + header
+    rows = df_values.itertuples(index=index, name=None)
+    
+    if pyexcelerate is not None:
+        workbook = pyexcelerate.Workbook()
+        worksheet = workbook.new_sheet(sheet_name, data=[header, *rows])
+        # 書式を1つも使わないとstyles.xmlが空になり、openpyxlでの読み込み時に警告が出るため、
+        # openpyxlで保存する場合と同じくヘッダー行を太字にする
+        header_style = pyexcelerate.Style(font=pyexcelerate.Font(bold=True))
+        worksheet.set_row_style(1, header_style)
+        workbook.save(str(file_path))
+        return
+    
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_name)
+    
+    header_font = Font(bold=True)
+    header_cells = []
+    for value in header:
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.font = header_font
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+    for row in rows:
+        worksheet.append(row)
+    
+    workbook.save(file_path)
+
+
 def ensure_output_dir(path: str) -> None:
     """
     指定されたディレクトリが存在しない場合は作成する
@@ -6,16 +6,55 @@
 - 外れ値の判定
 """
 
-from typing import Tuple, Optional
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Tuple, Optional
 
 import numpy as np
 import pandas as pd
 
+# Numbaで計算する最小の要素数（小さな配列ではNumPyの方が速い）
+# Numbaは任意の依存パッケージで、この要素数以上の配列を扱う場合のみ読み込む
+# （インストールされていない場合はNumPyで計算する）
+_NUMBA_MIN_SIZE = 100_000
+
+# add_financial_ratiosの計算結果のキャッシュ（キー：入力列のフィンガープリント、値：計算した指標列）
+# 副作用：モジュール内で状態を保持する。最大_RATIO_CACHE_SIZE件を超えると古いものから破棄する
+_RATIO_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_RATIO_CACHE_SIZE = 8
+
+# 財務指標の計算に使用する列（キャッシュのキーはこれらの列のみから作成する）
+_RATIO_INPUT_COLS = (
+    "売上高",
+    "営業利益",
+    "当期純利益",
+    "総資産",
+    "自己資本",
+    "ROA",
+    "ROE",
+    "営業利益率",
+    "当期純利益率",
+)
+
+# add_financial_ratiosが追加する指標列（追加する順序）
+_RATIO_OUTPUT_COLS = (
+    "営業利益率",
+    "当期純利益率",
+    "自己資本比率",
+    "総資産回転率",
+    "ROE_ROA_gap",
+    "利益率差分",
+)
+
 
 def add_financial_ratios(df: pd.DataFrame) -> pd.DataFrame:
     """
     財務指標を追加する
     
+    計算に使用する列の内容が同じであれば計算結果をキャッシュから再利用する。
+    （それ以外の列は常に入力のデータフレームのものがそのまま使われる）
+    
     以下の指標を計算して列として追加：
     - 営業利益率 = 営業利益 / 売上高
     - 当期純利益率 = 当期純利益 / 売上高
@@ -33,30 +72,113 @@ def add_financial_ratios(df: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         指標が追加されたデータフレーム
     """
-    df_result = df.copy()
+    available_cols = frozenset(df.columns)
+    input_cols = [col for col in _RATIO_INPUT_COLS if col in available_cols]
+    
+    # 列の追加・置き換えのみを行うため浅いコピーで十分（元のデータフレームは変更されない）
+    df_result = df.copy(deep=False)
+    if not input_cols:
+        return df_result
+    
+    df_input = df[input_cols]
+    key = _ratio_cache_key(df_input)
+    
+    ratios = _RATIO_CACHE.get(key)
+    if ratios is None:
+        df_computed = _compute_financial_ratios(df_input)
+        output_cols = [col for col in _RATIO_OUTPUT_COLS if col in df_computed.columns]
+        ratios = df_computed[output_cols]
+        
+        _RATIO_CACHE[key] = ratios
+        if len(_RATIO_CACHE) > _RATIO_CACHE_SIZE:
+            _RATIO_CACHE.popitem(last=False)
+    else:
+        _RATIO_CACHE.move_to_end(key)
+    
+    # 呼び出し側での変更がキャッシュに波及しないように、指標列はコピーして追加する
+    # （キーにインデックスを含むため、インデックスは入力と一致している）
+    for col in ratios.columns:
+        df_result[col] = ratios[col].copy()
+    
+    return df_result
+
+
+def _ratio_cache_key(df_input: pd.DataFrame) -> tuple:
+    """
+    財務指標の計算に使用する列から、キャッシュのキーを作成する
+    
+    データフレーム全体ではなく計算に使用する列のみをハッシュ化するため、
+    列数の多いデータでもキーの作成コストが小さい。
+    
+    Parameters
+    ----------
+    df_input : pd.DataFrame
+        財務指標の計算に使用する列のみを含むデータフレーム
+    
+    Returns
+    -------
+    tuple
+        キャッシュのキー
+    """
+    row_hashes = pd.util.hash_pandas_object(df_input, index=True).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes()).hexdigest()
+    
+    return (
+        df_input.shape,
+        tuple(df_input.columns),
+        tuple(str(dtype) for dtype in df_input.dtypes),
+        digest,
+    )
+
+
+def _compute_financial_ratios(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    財務指標を計算して列として追加する（キャッシュを介さない本体）
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        財務データを含むデータフレーム
+    
+    Returns
+    -------
+    pd.DataFrame
+        指標が追加されたデータフレーム
+    """
+    # 列の追加・置き換えのみを行うため浅いコピーで十分（元のデータフレームは変更されない）
+    df_result = df.copy(deep=False)
+    
+    # 列の有無は集合で判定する（Index.__contains__を繰り返し呼ばない）
+    # 計算で追加した列も後続の判定で使うため、追加のたびに集合へ加える
+    cols = set(df.columns)
     
     # 営業利益率（%）
-    if "営業利益" in df.columns and "売上高" in df.columns:
+    if "営業利益" in cols and "売上高" in cols:
         df_result["営業利益率"] = (df_result["営業利益"] / df_result["売上高"]) * 100
+        cols.add("営業利益率")
     
     # 当期純利益率（%）
-    if "当期純利益" in df.columns and "売上高" in df.columns:
+    if "当期純利益" in cols and "売上高" in cols:
         df_result["当期純利益率"] = (df_result["当期純利益"] / df_result["売上高"]) * 100
+        cols.add("当期純利益率")
     
     # 自己資本比率（%）
-    if "自己資本" in df.columns and "総資産" in df.columns:
+    if "自己資本" in cols and "総資産" in cols:
         df_result["自己資本比率"] = (df_result["自己資本"] / df_result["総資産"]) * 100
+        cols.add("自己資本比率")
     
     # 総資産回転率（回）
-    if "売上高" in df.columns and "総資産" in df.columns:
+    if "売上高" in cols and "総資産" in cols:
         df_result["総資産回転率"] = df_result["売上高"] / df_result["総資産"]
+        cols.add("総資産回転率")
     
     # ROE-ROA差分
-    if "ROE" in df.columns and "ROA" in df.columns:
+    if "ROE" in cols and "ROA" in cols:
         df_result["ROE_ROA_gap"] = df_result["ROE"] - df_result["ROA"]
+        cols.add("ROE_ROA_gap")
     
     # 利益率差分（営業利益率 - 当期純利益率）
-    if "営業利益率" in df_result.columns and "当期純利益率" in df_result.columns:
+    if "営業利益率" in cols and "当期純利益率" in cols:
         df_result["利益率差分"] = df_result["営業利益率"] - df_result["当期純利益率"]
     
     return df_result
@@ -83,14 +205,22 @@ def normalize_percentage_columns(
     pd.DataFrame
         正規化後のデータフレーム
     """
-    df_result = df.copy()
+    # 列の追加・置き換えのみを行うため浅いコピーで十分（元のデータフレームは変更されない）
+    df_result = df.copy(deep=False)
+    
+    available_cols = frozenset(df_result.columns)
     
     for col in cols:
-        if col not in df_result.columns:
+        if col not in available_cols:
+            continue
+        
+        # 最大値はNumPy配列のnanmaxで求める（全て欠損の列は判定できないため変換しない）
+        values = df_result[col].to_numpy(dtype=float, na_value=np.nan)
+        if np.isnan(values).all():
             continue
         
         # 最大値が1以下の場合は0-1スケールと判断して100倍
-        max_val = df_result[col].max()
+        max_val = np.nanmax(values)
         if max_val <= 1.0 and max_val > 0:
             print(f"列 '{col}' を100倍してパーセント表記に変換しました")
             df_result[col] = df_result[col] * 100
@@ -98,6 +228,189 @@ def normalize_percentage_columns(
     return df_result
 
 
+def detect_outliers(
+    df: pd.DataFrame,
+    col: str,
+    factor: float = 1.5,
+    threshold: float = 3.0
+) -> Tuple[pd.Series, pd.Series, float, float]:
+    """
+    IQR法とZ-score法の外れ値をまとめて検出する
+    
+    列の値を一度だけNumPy配列として取り出し、四分位点（np.partition）と
+    平均・標準偏差を同じ配列から計算する。
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        対象のデータフレーム
+    col : str
+        外れ値を検出する列名
+    factor : float, default 1.5
+        IQRに掛ける係数（通常は1.5）
+    threshold : float, default 3.0
+        外れ値とみなすZ-scoreの閾値
+    
+    Returns
+    -------
+    iqr_outliers : pd.Series
+        IQR法で外れ値かどうかのブール値（Trueが外れ値）
+    zscore_outliers : pd.Series
+        Z-score法で外れ値かどうかのブール値（Trueが外れ値）
+    lower_bound : float
+        IQR法の下限値
+    upper_bound : float
+        IQR法の上限値
+    """
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = values[~np.isnan(values)]
+    n_valid = valid.size
+    
+    # 欠損値を除いた値で統計量を計算する（pandasのskipnaと同じ扱い）
+    if n_valid == 0:
+        Q1 = Q3 = np.nan
+    else:
+        # 四分位点（線形補間、pandasのquantileと同じ定義）に必要な順位を1回のpartitionで求める
+        pos1 = (n_valid - 1) * 0.25
+        pos3 = (n_valid - 1) * 0.75
+        ranks = sorted({
+            int(np.floor(pos1)),
+            int(np.ceil(pos1)),
+            int(np.floor(pos3)),
+            int(np.ceil(pos3)),
+        })
+        partitioned = np.partition(valid, ranks)
+        Q1 = _interpolate_rank(partitioned, pos1)
+        Q3 = _interpolate_rank(partitioned, pos3)
+    
+    IQR = Q3 - Q1
+    lower_bound = Q1 - factor * IQR
+    upper_bound = Q3 + factor * IQR
+    
+    iqr_mask = (values < lower_bound) | (values > upper_bound)
+    zscore_mask = _zscore_mask(values, valid, threshold)
+    
+    iqr_outliers = pd.Series(iqr_mask, index=df.index, name=col)
+    zscore_outliers = pd.Series(zscore_mask, index=df.index, name=col)
+    
+    return iqr_outliers, zscore_outliers, float(lower_bound), float(upper_bound)
+
+
+def _zscore_mask(
+    values: np.ndarray,
+    valid: np.ndarray,
+    threshold: float
+) -> np.ndarray:
+    """
+    Z-scoreの絶対値が閾値を超える要素のマスクを作成する
+    
+    大きな配列でNumbaが使える場合は、平均・標準偏差・判定をJITコンパイルした
+    ループで計算し、一時配列を作らずにマスクを直接求める。
+    
+    Parameters
+    ----------
+    values : np.ndarray
+        対象の値（欠損値を含んでよい）
+    valid : np.ndarray
+        valuesから欠損値を除いた値
+    threshold : float
+        外れ値とみなすZ-scoreの閾値
+    
+    Returns
+    -------
+    np.ndarray
+        外れ値かどうかのブール値（Trueが外れ値、欠損値はFalse）
+    """
+    if values.size >= _NUMBA_MIN_SIZE:
+        zscore_mask_numba = _load_zscore_mask_numba()
+        if zscore_mask_numba is not None:
+            return zscore_mask_numba(values, threshold)
+    
+    mean = valid.mean() if valid.size > 0 else np.nan
+    std = valid.std(ddof=1) if valid.size > 1 else np.nan
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.abs((values - mean) / std) > threshold
+
+
+@lru_cache(maxsize=1)
+def _load_zscore_mask_numba() -> Optional[Callable]:
+    """
+    _zscore_maskのNumba実装を読み込む（初回の呼び出し時にのみnumbaをimportする）
+    
+    numbaのimportには時間がかかるため、metricsモジュールの読み込み時ではなく、
+    Numbaで計算する大きさの配列を初めて扱うときに読み込む。
+    
+    Returns
+    -------
+    Callable, optional
+        JITコンパイルする関数（numbaがインストールされていない場合はNone）
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(parallel=True, cache=True, error_model="numpy")
+    def _zscore_mask_numba(values: np.ndarray, threshold: float) -> np.ndarray:
+        """
+        _zscore_maskのNumba実装（欠損値を除外して平均・不偏標準偏差を計算する）
+        
+        Parameters
+        ----------
+        values : np.ndarray
+            対象の値（欠損値を含んでよい）
+        threshold : float
+            外れ値とみなすZ-scoreの閾値
+        
+        Returns
+        -------
+        np.ndarray
+            外れ値かどうかのブール値（Trueが外れ値、欠損値はFalse）
+        """
+        total = 0.0
+        count = 0
+        for i in prange(values.size):
+            if not np.isnan(values[i]):
+                total += values[i]
+                count += 1
+        mean = total / count if count > 0 else np.nan
+        
+        squared_sum = 0.0
+        for i in prange(values.size):
+            if not np.isnan(values[i]):
+                squared_sum += (values[i] - mean) ** 2
+        std = np.sqrt(squared_sum / (count - 1)) if count > 1 else np.nan
+        
+        out = np.empty(values.size, dtype=np.bool_)
+        for i in prange(values.size):
+            out[i] = abs((values[i] - mean) / std) > threshold
+        return out
+    
+    return _zscore_mask_numba
+
+
+def _interpolate_rank(partitioned: np.ndarray, pos: float) -> float:
+    """
+    partition済みの配列から、指定位置の値を線形補間で求める
+    
+    Parameters
+    ----------
+    partitioned : np.ndarray
+        floor(pos)・ceil(pos)の順位でpartition済みの配列
+    pos : float
+        求める位置（0始まりの順位）
+    
+    Returns
+    -------
+    float
+        補間した値
+    """
+    lo = int(np.floor(pos))
+    hi = int(np.ceil(pos))
+    return partitioned[lo] + (partitioned[hi] - partitioned[lo]) * (pos - lo)
+
+
 def detect_outliers_iqr(
     df: pd.DataFrame,
     col: str,
@@ -124,14 +437,7 @@ def detect_outliers_iqr(
     upper_bound : float
         上限値
     """
-    Q1 = df[col].quantile(0.25)
-    Q3 = df[col].quantile(0.75)
-    IQR = Q3 - Q1
-    
-    lower_bound = Q1 - factor * IQR
-    upper_bound = Q3 + factor * IQR
-    
-    outliers = (df[col] < lower_bound) | (df[col] > upper_bound)
+    outliers, _, lower_bound, upper_bound = detect_outliers(df, col, factor=factor)
     
     return outliers, lower_bound, upper_bound
 
@@ -158,11 +464,7 @@ def detect_outliers_zscore(
     pd.Series
         外れ値かどうかのブール値（Trueが外れ値）
     """
-    mean = df[col].mean()
-    std = df[col].std()
-    
-    z_scores = np.abs((df[col] - mean) / std)
-    outliers = z_scores > threshold
+    _, outliers, _, _ = detect_outliers(df, col, threshold=threshold)
     
     return outliers
 
@@ -196,21 +498,119 @@ def get_top_bottom_companies(
     # 欠損値を除外
     df_valid = df[[company_col, col]].dropna()
     
+    values = df_valid[col].to_numpy(dtype=np.float64)
+    names = df_valid[company_col].to_numpy()
+    
+    return _top_bottom_from_arrays(names, values, n)
+
+
+def get_top_bottom_batch(
+    df: pd.DataFrame,
+    cols: list[str],
+    n: int = 3,
+    company_col: str = "企業名"
+) -> dict:
+    """
+    複数列の上位・下位企業をまとめて取得する
+    
+    企業名と対象列をそれぞれ一度だけ配列に変換し、列ごとに上位・下位を求める。
+    各列の結果はget_top_bottom_companiesと同じ。
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        対象のデータフレーム
+    cols : list[str]
+        ソート対象の列名のリスト
+    n : int, default 3
+        取得する企業数
+    company_col : str, default "企業名"
+        企業名を含む列名
+    
+    Returns
+    -------
+    dict
+        列名をキーとする辞書
+        各値はget_top_bottom_companiesの戻り値と同じ形式の辞書
+    """
+    names = df[company_col].to_numpy()
+    has_name = df[company_col].notna().to_numpy()
+    values = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    results = {}
+    for i, col in enumerate(cols):
+        # 企業名・値のいずれかが欠損している行を除外
+        col_values = values[:, i]
+        valid = has_name & ~np.isnan(col_values)
+        results[col] = _top_bottom_from_arrays(names[valid], col_values[valid], n)
+    
+    return results
+
+
+def _top_bottom_from_arrays(names: np.ndarray, values: np.ndarray, n: int) -> dict:
+    """
+    企業名と値の配列から上位・下位n社を取得する
+    
+    Parameters
+    ----------
+    names : np.ndarray
+        企業名
+    values : np.ndarray
+        対象の値（欠損値を含まないこと）
+    n : int
+        取得する企業数
+    
+    Returns
+    -------
+    dict
+        'top'と'bottom'をキーとする辞書
+        各値は企業名と値のタプルのリスト
+    """
     # 上位n社
-    top_companies = df_valid.nlargest(n, col)
-    top_list = [
-        (row[company_col], row[col]) 
-        for _, row in top_companies.iterrows()
-    ]
-    
-    # 下位n社
-    bottom_companies = df_valid.nsmallest(n, col)
-    bottom_list = [
-        (row[company_col], row[col]) 
-        for _, row in bottom_companies.iterrows()
-    ]
+    top_idx = _top_n_indices(values, n)
+    top_list = list(zip(names[top_idx].tolist(), values[top_idx].tolist()))
+    
+    # 下位n社（符号を反転して上位として取得する）
+    bottom_idx = _top_n_indices(-values, n)
+    bottom_list = list(zip(names[bottom_idx].tolist(), values[bottom_idx].tolist()))
     
     return {
         "top": top_list,
         "bottom": bottom_list
     }
+
+
+def _top_n_indices(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    値の大きい順に上位n件の位置を取得する
+    
+    全体をソートせず、np.partitionでn番目の値を求めてから候補のみを並べ替える（O(N)）。
+    同値の場合は元の並び順を優先する（DataFrame.nlargest(keep="first")と同じ結果）。
+    
+    Parameters
+    ----------
+    values : np.ndarray
+        対象の値（欠損値を含まないこと）
+    n : int
+        取得する件数
+    
+    Returns
+    -------
+    np.ndarray
+        上位n件の位置（値の降順）
+    """
+    if n <= 0:
+        return np.array([], dtype=np.intp)
+    
+    if n >= values.size:
+        return np.argsort(-values, kind="stable")
+    
+    # n番目に大きい値
+    kth_value = np.partition(values, values.size - n)[values.size - n]
+    
+    # n番目の値より大きいものは全て採用し、同値のものは先頭から不足分だけ採用する
+    greater_idx = np.flatnonzero(values > kth_value)
+    tie_idx = np.flatnonzero(values == kth_value)[: n - greater_idx.size]
+    candidate_idx = np.concatenate([greater_idx, tie_idx])
+    
+    return candidate_idx[np.argsort(-values[candidate_idx], kind="stable")]
@@ -5,12 +5,30 @@
 - 数値列の型変換
 - 必須列の存在確認
 - 欠損値の処理
+- 分析共通の前処理（読み込み〜財務指標の追加、キャッシュ付き）
 """
 
+import os
+import re
+from pathlib import Path
 from typing import List, Optional, Literal
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+from . import io, metrics
+from .io import CACHE_DIR
+
+# 数値変換の前に除去する文字（カンマ・全角カンマ、前後の空白）
+_NUMERIC_NOISE_PATTERN = re.compile(r"[,，]|^\s+|\s+$")
+
+# 分析共通の前処理で数値型に変換する列と、パーセント表記を正規化する列
+_PREPARED_NUMERIC_COLS = ["売上高", "営業利益", "当期純利益", "総資産", "自己資本", "ROA", "ROE"]
+_PREPARED_PERCENTAGE_COLS = ["ROA", "ROE"]
+
+# 前処理済みデータのキャッシュのバージョン（前処理の内容を変更した場合は値を上げる）
+_PREPARED_CACHE_VERSION = 1
 
 
 def coerce_numeric(
@@ -46,9 +64,9 @@ def coerce_numeric(
             continue
         
         # 文字列型の場合はカンマなどを除去
-        if df[col].dtype == "object":
-            df[col] = df[col].astype(str).str.replace(",", "").str.replace("，", "")
-            df[col] = df[col].str.strip()
+        # （カンマ・全角カンマの除去と前後の空白除去を1回の正規表現置換で行う）
+        if is_object_dtype(df[col]) or is_string_dtype(df[col]):
+            df[col] = df[col].astype(str).str.replace(_NUMERIC_NOISE_PATTERN, "", regex=True)
         
         # 数値に変換（変換できない場合はNaNになる）
         df[col] = pd.to_numeric(df[col], errors="coerce")
@@ -75,7 +93,9 @@ def validate_columns(
     ValueError
         必須列が存在しない場合
     """
-    missing_cols = [col for col in required_cols if col not in df.columns]
+    # 列名の集合を一度だけ作成して存在確認する（エラーメッセージ用に順序は保持）
+    existing_cols = set(df.columns)
+    missing_cols = [col for col in required_cols if col not in existing_cols]
     
     if missing_cols:
         raise ValueError(f"必須列が見つかりません: {missing_cols}")
@@ -108,29 +128,135 @@ def handle_missing(
     pd.DataFrame
         処理後のデータフレーム
     """
-    df_result = df.copy()
+    # 行の削除・列の置き換えは新しいオブジェクトを作るため、浅いコピーで十分
+    # （元のデータフレームは変更されない）
+    df_result = df.copy(deep=False)
     
     # 対象列の設定
     cols_to_check = subset if subset is not None else df.columns.tolist()
     
     # 欠損値の確認
-    missing_counts = df_result[cols_to_check].isnull().sum()
+    # まず欠損の有無だけを判定し、欠損がない場合は列ごとの集計を省略する
+    missing_mask = df_result[cols_to_check].isnull().to_numpy()
+    if not missing_mask.any():
+        print("欠損値は検出されませんでした")
+        return df_result
+    
+    missing_counts = pd.Series(missing_mask.sum(axis=0), index=cols_to_check)
     has_missing = missing_counts > 0
     
-    if has_missing.any():
-        print("欠損値が検出されました:")
-        for col in missing_counts[has_missing].index:
-            print(f"  {col}: {missing_counts[col]}件")
-        
-        if strategy == "drop":
-            df_result = df_result.dropna(subset=cols_to_check)
-            print(f"欠損を含む行を削除しました（残り{len(df_result)}行）")
-        elif strategy == "fill_zero":
-            df_result[cols_to_check] = df_result[cols_to_check].fillna(0)
-            print("欠損値を0で埋めました")
-        elif strategy == "warn":
-            print("警告: 欠損値が存在します（処理は行いません）")
-    else:
-        print("欠損値は検出されませんでした")
+    print("欠損値が検出されました:")
+    for col in missing_counts[has_missing].index:
+        print(f"  {col}: {missing_counts[col]}件")
+    
+    if strategy == "drop":
+        df_result = df_result.dropna(subset=cols_to_check)
+        print(f"欠損を含む行を削除しました（残り{len(df_result)}行）")
+    elif strategy == "fill_zero":
+        df_result[cols_to_check] = df_result[cols_to_check].fillna(0)
+        print("欠損値を0で埋めました")
+    elif strategy == "warn":
+        print("警告: 欠損値が存在します（処理は行いません）")
     
     return df_result
+
+
+def prepare_financial_data(path: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    分析共通の前処理を行った財務データを返す
+    
+    以下の処理を順に行う（同じExcelファイルに対する結果はキャッシュする）：
+    1. Excelファイルの読み込み（io.load_financial_xlsx）
+    2. 数値列の型変換（_PREPARED_NUMERIC_COLSのうち存在する列）
+    3. ROA/ROEのパーセント表記の正規化
+    4. 財務指標の追加（metrics.add_financial_ratios）
+    
+    前処理の結果は CACHE_DIR にParquet形式で保存し、同じExcelファイル
+    （更新時刻・サイズが同じ）に対しては2回目以降そちらから読み込む。
+    必須列の確認や欠損値の処理は各スクリプトで行う。
+    
+    Parameters
+    ----------
+    path : str
+        読み込むExcelファイルのパス
+    use_cache : bool, default True
+        前処理済みデータのキャッシュを利用するかどうか
+    
+    Returns
+    -------
+    pd.DataFrame
+        前処理済みのデータフレーム
+    
+    Raises
+    ------
+    FileNotFoundError
+        指定されたファイルが見つからない場合
+    """
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"ファイルが見つかりません: {path}")
+    
+    if not use_cache:
+        return _prepare_financial_data(file_path)
+    
+    stat = file_path.stat()
+    cache_prefix = f"prepared_{io.cache_file_prefix(file_path)}"
+    cache_path = CACHE_DIR / (
+        f"{cache_prefix}.v{_PREPARED_CACHE_VERSION}"
+        f".{stat.st_mtime_ns}.{stat.st_size}.parquet"
+    )
+    
+    if cache_path.exists():
+        # 読み込めないキャッシュ（破損など）は前処理をやり直して作り直す
+        try:
+            return pd.read_parquet(cache_path, dtype_backend="pyarrow")
+        except (OSError, ValueError) as e:
+            print(f"警告: 前処理済みデータのキャッシュを読み込めませんでした: {e}")
+    
+    df = _prepare_financial_data(file_path)
+    
+    # キャッシュの保存に失敗しても前処理の結果はそのまま返す
+    # 複数のスクリプトを同時に実行しても書き込み途中のファイルを読まないよう、
+    # 一時ファイルに書き出してから置き換える
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        io.ensure_output_dir(str(CACHE_DIR))
+        # 同じファイルの古いキャッシュは不要なので削除する
+        for old_cache in CACHE_DIR.glob(f"{cache_prefix}.*.parquet"):
+            if old_cache != cache_path:
+                old_cache.unlink(missing_ok=True)
+        df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except (ImportError, TypeError, ValueError, OSError) as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"警告: 前処理済みデータのキャッシュを保存できませんでした: {e}")
+    
+    return df
+
+
+def _prepare_financial_data(file_path: Path) -> pd.DataFrame:
+    """
+    分析共通の前処理を行う（キャッシュを介さない本体）
+    
+    Parameters
+    ----------
+    file_path : Path
+        読み込むExcelファイルのパス
+    
+    Returns
+    -------
+    pd.DataFrame
+        前処理済みのデータフレーム
+    """
+    df = io.load_financial_xlsx(str(file_path))
+    
+    numeric_cols = [col for col in _PREPARED_NUMERIC_COLS if col in df.columns]
+    df = coerce_numeric(df, numeric_cols)
+    df = metrics.normalize_percentage_columns(df, _PREPARED_PERCENTAGE_COLS)
+    df = metrics.add_financial_ratios(df)
+    
+    # 型変換した列（NumPyの型になる）もPyArrowバックエンドの型に揃える
+    # （キャッシュから読み込んだ場合と型が一致するようにするため）
+    df = df.convert_dtypes(dtype_backend="pyarrow")
+    
+    return df
@@ -11,6 +11,18 @@ from typing import List, Optional, Dict, Any
 import pandas as pd
 import numpy as np
 
+# describeの統計量名と出力する列名の対応（出力する列の順序を兼ねる）
+_SUMMARY_STATS_COLUMNS = {
+    "count": "件数",
+    "mean": "平均",
+    "50%": "中央値",
+    "std": "標準偏差",
+    "min": "最小値",
+    "25%": "25%点",
+    "75%": "75%点",
+    "max": "最大値",
+}
+
 
 def generate_summary_stats(
     df: pd.DataFrame,
@@ -32,26 +44,31 @@ def generate_summary_stats(
         統計量をまとめたデータフレーム
         （行：統計量の種類、列：指定した列）
     """
-    stats = []
+    target_cols = [col for col in cols if col in df.columns]
+    if not target_cols:
+        return pd.DataFrame()
+    
+    df_target = df[target_cols]
+    numeric_cols = df_target.select_dtypes(include=[np.number]).columns
+    
+    # describeで数値列の統計量を一度に計算する
+    # （describeは数値以外の列を黙って除くため、指定した列の順に並べ直し、
+    # 数値以外の列は件数以外の統計量を欠損値とする）
+    if len(numeric_cols) > 0:
+        described = df_target[numeric_cols].describe(
+            include=[np.number], percentiles=[0.25, 0.5, 0.75]
+        ).T
+    else:
+        described = pd.DataFrame(columns=list(_SUMMARY_STATS_COLUMNS), dtype=float)
     
-    for col in cols:
-        if col not in df.columns:
-            continue
-        
-        col_stats = {
-            "列名": col,
-            "件数": df[col].count(),
-            "平均": df[col].mean(),
-            "中央値": df[col].median(),
-            "標準偏差": df[col].std(),
-            "最小値": df[col].min(),
-            "25%点": df[col].quantile(0.25),
-            "75%点": df[col].quantile(0.75),
-            "最大値": df[col].max()
-        }
-        stats.append(col_stats)
-    
-    return pd.DataFrame(stats)
+    # 列名を日本語に置き換える
+    stats = described.reindex(
+        index=target_cols, columns=list(_SUMMARY_STATS_COLUMNS)
+    ).rename(columns=_SUMMARY_STATS_COLUMNS)
+    stats["件数"] = df_target.count().to_numpy()
+    stats.insert(0, "列名", stats.index)
+    
+    return stats.reset_index(drop=True)
 
 
 def create_markdown_summary(
@@ -74,30 +91,33 @@ def create_markdown_summary(
         - "heading": セクションの見出し
         - "content": セクションの内容（文字列またはリスト）
     """
-    with open(output_path, "w", encoding="utf-8") as f:
-        # タイトル
-        f.write(f"# {title}\n\n")
+    # 本文を文字列のリストに組み立て、最後に1回で書き込む
+    # タイトル
+    parts = [f"# {title}\n\n"]
+    
+    # 各セクション
+    for section in sections:
+        heading = section.get("heading", "")
+        content = section.get("content", "")
+        
+        # 見出し
+        if heading:
+            parts.append(f"## {heading}\n\n")
         
-        # 各セクション
-        for section in sections:
-            heading = section.get("heading", "")
-            content = section.get("content", "")
-            
-            # 見出し
-            if heading:
-                f.write(f"## {heading}\n\n")
-            
-            # 内容
-            if isinstance(content, list):
-                for item in content:
-                    # 見出し（###で始まる）や空文字列の場合は箇条書き記号を付けない
-                    if item.strip().startswith("###") or item.strip() == "":
-                        f.write(f"{item}\n")
-                    else:
-                        f.write(f"- {item}\n")
-                f.write("\n")
-            else:
-                f.write(f"{content}\n\n")
+        # 内容
+        if isinstance(content, list):
+            for item in content:
+                # 見出し（###で始まる）や空文字列の場合は箇条書き記号を付けない
+                if item.strip().startswith("###") or item.strip() == "":
+                    parts.append(f"{item}\n")
+                else:
+                    parts.append(f"- {item}\n")
+            parts.append("\n")
+        else:
+            parts.append(f"{content}\n\n")
+    
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
     
     print(f"Markdownサマリーを保存しました: {output_path}")
 
@@ -140,7 +160,8 @@ def format_top_bottom_summary(
 
 def create_data_quality_report(
     df: pd.DataFrame,
-    required_cols: List[str]
+    required_cols: List[str],
+    column_count_label: str = "総列数"
 ) -> List[str]:
     """
     データ品質に関するレポートを生成する
@@ -151,6 +172,8 @@ def create_data_quality_report(
         対象のデータフレーム
     required_cols : List[str]
         必須列のリスト
+    column_count_label : str, default "総列数"
+        列数の見出し（必要な列のみを読み込んだ場合は"使用列数"などを指定する）
     
     Returns
     -------
@@ -161,7 +184,7 @@ def create_data_quality_report(
     
     # 基本情報
     report.append(f"総行数: {len(df)}")
-    report.append(f"総列数: {len(df.columns)}")
+    report.append(f"{column_count_label}: {len(df.columns)}")
     report.append("")
     
     # 欠損値の確認
@@ -277,27 +300,59 @@ def format_table_for_markdown(
     |           1 | 1,142,544    |  6.54 |
     |           2 | 267,071      |  9.76 |
     """
-    # コピーを作成して元のデータを変更しない
-    df_formatted = df.copy()
-    
-    # large_number_colsが指定されている場合、それらの列をカンマ区切り整数表記に変換
-    if large_number_cols:
-        for col in large_number_cols:
-            if col in df_formatted.columns:
-                df_formatted[col] = df_formatted[col].apply(
-                    lambda x: f"{x:,.0f}" if pd.notna(x) else ""
-                )
-    
-    # その他の数値列は小数点桁数で丸める
-    for col in df_formatted.columns:
-        if large_number_cols and col in large_number_cols:
-            # 既に文字列に変換済みなのでスキップ
-            continue
-        
-        # 数値型の列のみ処理
-        if pd.api.types.is_numeric_dtype(df_formatted[col]):
-            df_formatted[col] = df_formatted[col].apply(
-                lambda x: f"{x:.{decimal_places}f}" if pd.notna(x) else ""
-            )
+    large_cols = set(large_number_cols) if large_number_cols else set()
+    
+    # 列ごとの書式を先に決めておく（%形式の書式、カンマ区切りの有無）
+    # large_number_colsはカンマ区切り整数表記、その他の数値列は小数点桁数で丸める
+    column_formats = {
+        col: ("%.0f", True) if col in large_cols else (f"%.{decimal_places}f", False)
+        for col in df.columns
+        if col in large_cols or pd.api.types.is_numeric_dtype(df[col])
+    }
+    
+    # 列の置き換えのみを行うため浅いコピーで十分（元のデータは変更されない）
+    df_formatted = df.copy(deep=False)
+    for col, (fmt, thousands_sep) in column_formats.items():
+        df_formatted[col] = _format_numeric_column(
+            df[col], fmt, thousands_sep=thousands_sep
+        )
     
     return df_formatted.to_markdown()
+
+
+# 整数部の3桁ごとの位置（カンマを挿入する位置）にマッチする正規表現
+_THOUSANDS_PATTERN = r"(\d)(?=(?:\d{3})+(?:\.|$))"
+
+
+def _format_numeric_column(
+    series: pd.Series,
+    fmt: str,
+    thousands_sep: bool = False
+) -> pd.Series:
+    """
+    数値列を文字列に一括変換する
+    
+    要素ごとにPythonの関数を呼び出さず、NumPyの文字列演算で列全体をまとめて変換する。
+    欠損値は空文字列にする。
+    
+    Parameters
+    ----------
+    series : pd.Series
+        変換対象の数値列
+    fmt : str
+        %形式の書式（例: "%.2f"）
+    thousands_sep : bool, default False
+        整数部を3桁ごとにカンマで区切るかどうか
+    
+    Returns
+    -------
+    pd.Series
+        変換後の文字列の列
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    formatted = pd.Series(np.strings.mod(fmt, values), index=series.index, dtype=object)
+    if thousands_sep:
+        formatted = formatted.str.replace(_THOUSANDS_PATTERN, r"\1,", regex=True)
+    
+    return formatted.where(~np.isnan(values), "")
@@ -5,21 +5,45 @@
 - 散布図・バブル図の作成
 - 企業名ラベルの付与
 - 画像保存の統一処理
+- 入力データが変わっていない図の保存の省略
 """
 
+import importlib.util
+import os
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
-import japanize_matplotlib  # 日本語フォント対応 # noqa: F401
+import matplotlib
+from matplotlib import font_manager
+
+# スクリプトとして一括実行する場合は、GUIを使わないAggバックエンドで描画する
+# （MPLBACKENDが設定されている場合（Jupyterなど）や、VIZ_INTERACTIVE=1の場合はそのまま）
+# 副作用：pyplotの描画バックエンドをプロセス全体で切り替える
+if os.environ.get("VIZ_INTERACTIVE") != "1" and "MPLBACKEND" not in os.environ:
+    matplotlib.use("Agg")
+
+# 日本語フォント対応：japanize-matplotlibに同梱のフォント（IPAexゴシック）を既定のフォントにする
+# （import japanize_matplotlibと同じ設定。同パッケージはimport時にdistutilsを読み込み
+#  それだけで約0.1秒かかるため、importせずにフォントファイルを直接登録する）
+# 副作用：matplotlibのフォント一覧とrcParamsのfont.familyを変更する
+_japanize_spec = importlib.util.find_spec("japanize_matplotlib")
+if _japanize_spec is not None and _japanize_spec.origin is not None:
+    _japanize_font_dir = os.path.join(os.path.dirname(_japanize_spec.origin), "fonts")
+    for _font_path in font_manager.findSystemFonts(fontpaths=[_japanize_font_dir]):
+        font_manager.fontManager.addfont(_font_path)
+    matplotlib.rc("font", family="IPAexGothic")
+
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.transforms import offset_copy
+import numpy as np
 import pandas as pd
 import seaborn as sns
 
-# デフォルトのスタイル設定
-plt.style.use("seaborn-v0_8-darkgrid")
-sns.set_palette("husl")
-
-# スタイル設定後に日本語フォントを再設定（スタイルでリセットされるため）
-plt.rcParams["font.sans-serif"] = [
+# 日本語フォントの候補（インストールされている最初のフォントを使用する）
+_JAPANESE_FONT_CANDIDATES = [
     "Hiragino Sans",
     "Yu Gothic",
     "Meirio",
@@ -28,7 +52,17 @@ plt.rcParams["font.sans-serif"] = [
     "IPAPGothic",
     "Noto Sans CJK JP",
 ]
-plt.rcParams["axes.unicode_minus"] = False  # マイナス記号の文字化け対策
+
+# PNG保存時の圧縮設定（分析結果の画像のため、ファイルサイズより書き出し速度を優先する）
+_PNG_PIL_KWARGS = {"compress_level": 1, "optimize": False}
+
+# 表示しない描画で使い回す図（pyplotには登録しない）と、その余白の初期値
+# 副作用：モジュール内で図を保持し、各create_*関数の呼び出しごとにクリアして再利用する
+_shared_fig: Optional[Figure] = None
+_DEFAULT_SUBPLOT_PARAMS = {
+    key: plt.rcParams[f"figure.subplot.{key}"]
+    for key in ("left", "bottom", "right", "top", "wspace", "hspace")
+}
 
 
 def create_scatter_plot(
@@ -44,8 +78,8 @@ def create_scatter_plot(
     figsize: Tuple[float, float] = (10, 6),
     log_x: bool = False,
     log_y: bool = False,
-    dpi: int = 150,
-    show: bool = True,
+    dpi: int = 100,
+    show: Optional[bool] = None,
 ) -> None:
     """
     散布図を作成して保存する
@@ -76,18 +110,18 @@ def create_scatter_plot(
         X軸を対数スケールにするかどうか
     log_y : bool, default False
         Y軸を対数スケールにするかどうか
-    dpi : int, default 150
+    dpi : int, default 100
         保存時の解像度
-    show : bool, default True
-        グラフを表示するかどうか
+    show : bool, optional
+        グラフを表示するかどうか（Noneの場合は対話的なバックエンドでのみ表示）
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _create_figure(figsize, show)
 
     # 欠損値を除外
     df_plot = df[[x_col, y_col, company_col]].dropna()
 
     # 散布図を描画
-    ax.scatter(df_plot[x_col], df_plot[y_col], alpha=0.6, s=100)
+    plot_uniform_markers(ax, df_plot[x_col], df_plot[y_col], alpha=0.6)
 
     # ラベルの設定
     ax.set_xlabel(x_label if x_label else x_col, fontsize=12)
@@ -102,29 +136,19 @@ def create_scatter_plot(
 
     # 企業名のラベル付け
     if annotate:
-        for _, row in df_plot.iterrows():
-            ax.annotate(
-                row[company_col],
-                (row[x_col], row[y_col]),
-                xytext=(5, 5),
-                textcoords="offset points",
-                fontsize=8,
-                alpha=0.7,
-            )
+        annotate_points(ax, df_plot, x_col, y_col, company_col)
 
     # グリッド
     ax.grid(True, alpha=0.3)
 
     # 保存
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=dpi, bbox_inches="tight")
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi)
     print(f"散布図を保存しました: {output_path}")
 
-    # 表示
-    if show:
+    # 表示（表示しない場合は共有の図を使っているため、閉じずに次の描画で再利用する）
+    if _resolve_show(show):
         plt.show()
-    else:
-        plt.close()
 
 
 def create_bubble_chart(
@@ -140,8 +164,8 @@ def create_bubble_chart(
     company_col: str = "企業名",
     figsize: Tuple[float, float] = (10, 6),
     size_scale: float = 1.0,
-    dpi: int = 150,
-    show: bool = True,
+    dpi: int = 100,
+    show: Optional[bool] = None,
 ) -> None:
     """
     バブル図を作成して保存する
@@ -172,12 +196,12 @@ def create_bubble_chart(
         図のサイズ
     size_scale : float, default 1.0
         バブルサイズのスケーリング係数
-    dpi : int, default 150
+    dpi : int, default 100
         保存時の解像度
-    show : bool, default True
-        グラフを表示するかどうか
+    show : bool, optional
+        グラフを表示するかどうか（Noneの場合は対話的なバックエンドでのみ表示）
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _create_figure(figsize, show)
 
     # 欠損値を除外
     df_plot = df[[x_col, y_col, size_col, company_col]].dropna()
@@ -193,6 +217,7 @@ def create_bubble_chart(
         alpha=0.5,
         edgecolors="w",
         linewidth=0.5,
+        rasterized=True,
     )
 
     # ラベルの設定
@@ -202,29 +227,19 @@ def create_bubble_chart(
 
     # 企業名のラベル付け
     if annotate:
-        for _, row in df_plot.iterrows():
-            ax.annotate(
-                row[company_col],
-                (row[x_col], row[y_col]),
-                xytext=(5, 5),
-                textcoords="offset points",
-                fontsize=8,
-                alpha=0.7,
-            )
+        annotate_points(ax, df_plot, x_col, y_col, company_col)
 
     # グリッド
     ax.grid(True, alpha=0.3)
 
     # 保存
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=dpi, bbox_inches="tight")
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi)
     print(f"バブル図を保存しました: {output_path}")
 
-    # 表示
-    if show:
+    # 表示（表示しない場合は共有の図を使っているため、閉じずに次の描画で再利用する）
+    if _resolve_show(show):
         plt.show()
-    else:
-        plt.close()
 
 
 def create_bar_chart(
@@ -238,8 +253,8 @@ def create_bar_chart(
     figsize: Tuple[float, float] = (12, 6),
     sort_by: Optional[str] = None,
     ascending: bool = False,
-    dpi: int = 150,
-    show: bool = True,
+    dpi: int = 100,
+    show: Optional[bool] = None,
 ) -> None:
     """
     棒グラフを作成して保存する
@@ -266,29 +281,44 @@ def create_bar_chart(
         ソートする列名
     ascending : bool, default False
         昇順でソートするかどうか
-    dpi : int, default 150
+    dpi : int, default 100
         保存時の解像度
-    show : bool, default True
-        グラフを表示するかどうか
+    show : bool, optional
+        グラフを表示するかどうか（Noneの場合は対話的なバックエンドでのみ表示）
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _create_figure(figsize, show)
+
+    # ソート（sort_valuesは新しいデータフレームを返し、dfは読み取るだけなのでコピーは不要）
+    df_plot = df
+    if sort_by and sort_by in df.columns:
+        df_plot = df.sort_values(by=sort_by, ascending=ascending)
+
+    # 棒グラフを描画（列ごとに1回のax.barで描画し、pandasのプロット処理を経由しない）
+    # 配置はDataFrame.plot(kind="bar", width=0.8)と同じ（各カテゴリの中心に幅0.8でまとめる）
+    group_width = 0.8
+    bar_width = group_width / len(y_cols)
+    x = np.arange(len(df_plot))
+    left = x - group_width / 2
+
+    for i, col in enumerate(y_cols):
+        ax.bar(
+            left + (i + 0.5) * bar_width,
+            df_plot[col].to_numpy(),
+            bar_width,
+            label=col,
+        )
 
-    # ソート
-    df_plot = df.copy()
-    if sort_by and sort_by in df_plot.columns:
-        df_plot = df_plot.sort_values(by=sort_by, ascending=ascending)
+    ax.set_xlim(left[0] - 0.25, left[-1] + group_width + 0.25)
+    ax.set_xticks(x)
 
-    # 棒グラフを描画
-    df_plot.plot(x=x_col, y=y_cols, kind="bar", ax=ax, width=0.8)
+    # X軸のラベル（回転して表示）
+    ax.set_xticklabels(df_plot[x_col].astype(str).to_numpy(), rotation=45, ha="right")
 
     # ラベルの設定
     ax.set_xlabel(x_label if x_label else x_col, fontsize=12)
     ax.set_ylabel(y_label if y_label else "", fontsize=12)
     ax.set_title(title, fontsize=14, fontweight="bold")
 
-    # X軸のラベルを回転
-    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
-
     # 凡例
     ax.legend(loc="best")
 
@@ -296,15 +326,13 @@ def create_bar_chart(
     ax.grid(True, alpha=0.3, axis="y")
 
     # 保存
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=dpi, bbox_inches="tight")
+    fig.tight_layout()
+    save_figure(fig, output_path, dpi)
     print(f"棒グラフを保存しました: {output_path}")
 
-    # 表示
-    if show:
+    # 表示（表示しない場合は共有の図を使っているため、閉じずに次の描画で再利用する）
+    if _resolve_show(show):
         plt.show()
-    else:
-        plt.close()
 
 
 def annotate_points(
@@ -336,12 +364,257 @@ def annotate_points(
     """
     df_to_label = df if condition is None else df[condition]
 
-    for _, row in df_to_label.iterrows():
-        ax.annotate(
-            row[label_col],
-            (row[x_col], row[y_col]),
-            xytext=(5, 5),
-            textcoords="offset points",
-            fontsize=8,
-            alpha=0.7,
-        )
+    # 座標とラベルは配列としてまとめて取り出す（行ごとのSeries作成を避ける）
+    xs = df_to_label[x_col].to_numpy()
+    ys = df_to_label[y_col].to_numpy()
+    labels = df_to_label[label_col].to_numpy()
+
+    # 点から右上に5ポイントずらす変換を一度だけ作成し、全ラベルで共有する
+    # （ax.annotateより軽いax.textで描画する）
+    # ずらし幅をデータ座標に換算して座標に足す方法は、対数軸では点ごとに幅が変わり、
+    # 描画後に軸範囲や図のサイズが変わるとずれるため使わない
+    text_transform = offset_copy(ax.transData, fig=ax.figure, x=5, y=5, units="points")
+
+    for x, y, label in zip(xs, ys, labels):
+        ax.text(x, y, label, transform=text_transform, fontsize=8, alpha=0.7)
+
+
+def plot_uniform_markers(ax: plt.Axes, x, y, **kwargs) -> List[Line2D]:
+    """
+    サイズ・色が一定の点を、scatter(s=100)と同じ見た目のマーカーとして描画する
+
+    点ごとにパスを持つscatterではなく単一のLine2Dとして描画するため、点が多くても軽い。
+    マーカーはラスター化するため、PDF/SVGで保存する場合も文字はベクターのまま残る。
+
+    Parameters
+    ----------
+    ax : plt.Axes
+        プロットするAxesオブジェクト
+    x : array-like
+        X座標
+    y : array-like
+        Y座標
+    **kwargs
+        ax.plotに渡す追加のキーワード引数（alpha、labelなど。既定値の上書きも可）
+
+    Returns
+    -------
+    List[Line2D]
+        ax.plotの戻り値
+    """
+    options = {
+        "linestyle": "none",
+        "marker": "o",
+        "markersize": 10,
+        "markeredgewidth": plt.rcParams["lines.linewidth"],
+        "rasterized": True,
+        **kwargs,
+    }
+    return ax.plot(np.asarray(x), np.asarray(y), **options)
+
+
+@lru_cache(maxsize=1)
+def configure_matplotlib() -> None:
+    """
+    グラフのスタイルと日本語フォントを設定する
+
+    各create_*関数から呼び出される。2回目以降の呼び出しでは何もしない。
+    pyplotで直接グラフを作成するスクリプトでは、描画前に呼び出す。
+
+    副作用：matplotlibのrcParamsとseabornのカラーパレットを変更する
+    """
+    # デフォルトのスタイル設定
+    plt.style.use("seaborn-v0_8-darkgrid")
+    sns.set_palette("husl")
+
+    # スタイル設定後に日本語フォントを再設定（スタイルでリセットされるため）
+    plt.rcParams["font.sans-serif"] = _find_japanese_fonts()
+    plt.rcParams["axes.unicode_minus"] = False  # マイナス記号の文字化け対策
+
+    # 点数の多いパスを分割して描画し、Aggの描画処理を軽くする
+    plt.rcParams["agg.path.chunksize"] = 10000
+
+
+@lru_cache(maxsize=1)
+def warm_up_renderer() -> None:
+    """
+    小さな図を一度描画し、フォントの読み込みなど初回描画時の準備を済ませておく
+
+    複数の図を続けて作成するスクリプトの冒頭で呼び出す。2回目以降の呼び出しでは何もしない。
+    """
+    configure_matplotlib()
+
+    # pyplotには登録せず、Aggのキャンバスに直接描画する
+    fig = Figure(figsize=(1, 1))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    ax.plot([0, 1], [0, 1], "o")
+    ax.set_title("日本語 0123456789")
+    fig.canvas.draw()
+
+
+def _find_japanese_fonts() -> List[str]:
+    """
+    候補の中からインストールされている最初の日本語フォントを探す
+
+    描画のたびに見つからないフォントを順にたどらないよう、
+    見つかったフォントのみをfont.sans-serifに設定するために使用する。
+
+    Returns
+    -------
+    List[str]
+        使用するフォント名のリスト（どれも見つからない場合は候補をそのまま返す）
+    """
+    for family in _JAPANESE_FONT_CANDIDATES:
+        try:
+            font_manager.findfont(family, fallback_to_default=False)
+        except ValueError:
+            continue
+        return [family]
+
+    return list(_JAPANESE_FONT_CANDIDATES)
+
+
+def output_dpi() -> int:
+    """
+    pyplotで直接作成した図を保存する際の解像度を返す
+
+    通常は確認用として、各create_*関数の既定値と同じ100dpiで保存する。
+    環境変数 VIZ_HIGH_DPI=1 を設定した場合は、提出用として150dpiで保存する。
+
+    Returns
+    -------
+    int
+        保存時の解像度
+    """
+    if os.environ.get("VIZ_HIGH_DPI") == "1":
+        return 150
+    return 100
+
+
+def show_or_close(show: Optional[bool] = None) -> None:
+    """
+    現在の図を表示する、または閉じる
+
+    Aggなどの非対話的なバックエンドではplt.show()は何も表示しないため、
+    図を閉じてメモリを解放する。
+
+    Parameters
+    ----------
+    show : bool, optional
+        グラフを表示するかどうか（Noneの場合は対話的なバックエンドでのみ表示）
+    """
+    if _resolve_show(show):
+        plt.show()
+    else:
+        plt.close()
+
+
+def _resolve_show(show: Optional[bool]) -> bool:
+    """
+    グラフを表示するかどうかを決定する
+
+    Parameters
+    ----------
+    show : bool, optional
+        グラフを表示するかどうか（Noneの場合は対話的なバックエンドでのみ表示）
+
+    Returns
+    -------
+    bool
+        表示する場合はTrue
+    """
+    if show is None:
+        return matplotlib.get_backend().lower() != "agg"
+    return show
+
+
+def _create_figure(
+    figsize: Tuple[float, float],
+    show: Optional[bool],
+) -> Tuple[Figure, plt.Axes]:
+    """
+    描画用の図とAxesを作成する
+
+    表示しない場合は、pyplotに登録しない共有の図をクリアして再利用し、
+    図・キャンバスの作成コストを描画ごとに払わないようにする。
+
+    Parameters
+    ----------
+    figsize : Tuple[float, float]
+        図のサイズ
+    show : bool, optional
+        グラフを表示するかどうか
+
+    Returns
+    -------
+    Tuple[Figure, plt.Axes]
+        図とAxes
+    """
+    global _shared_fig
+
+    configure_matplotlib()
+
+    if _resolve_show(show):
+        return plt.subplots(figsize=figsize)
+
+    if _shared_fig is None:
+        _shared_fig = Figure()
+    else:
+        # 前回のtight_layoutで変更された余白も初期値に戻す（clearでは戻らないため）
+        _shared_fig.clear()
+        _shared_fig.subplotpars.update(**_DEFAULT_SUBPLOT_PARAMS)
+
+    _shared_fig.set_size_inches(*figsize)
+    ax = _shared_fig.add_subplot(111)
+
+    return _shared_fig, ax
+
+
+def save_figure(
+    fig: Figure,
+    output_path: str,
+    dpi: int = 100,
+    **savefig_kwargs,
+) -> None:
+    """
+    図をファイルに保存する
+
+    保存先がPNGの場合は、書き出し速度を優先した圧縮設定で保存する。
+    余白は事前にtight_layoutで調整しておく（bbox_inches="tight"は保存時に描画が
+    2回走るため、凡例を図の外側に置く場合など必要なときだけ指定する）。
+
+    Parameters
+    ----------
+    fig : Figure
+        保存する図
+    output_path : str
+        保存先のファイルパス
+    dpi : int, default 100
+        保存時の解像度
+    **savefig_kwargs
+        savefigに渡す追加のキーワード引数（bbox_inchesなど）
+    """
+    fig.savefig(
+        output_path, dpi=dpi, **{**_savefig_options(output_path), **savefig_kwargs}
+    )
+
+
+def _savefig_options(output_path: str) -> dict:
+    """
+    保存先の形式に応じたsavefigの追加オプションを返す
+
+    Parameters
+    ----------
+    output_path : str
+        保存先のファイルパス
+
+    Returns
+    -------
+    dict
+        savefigに渡す追加のキーワード引数（PNG以外は空）
+    """
+    if str(output_path).lower().endswith(".png"):
+        return {"pil_kwargs": dict(_PNG_PIL_KWARGS)}
+    return {}
+
@@ -20,14 +20,15 @@
 import sys
 from pathlib import Path
 
-import japanize_matplotlib  # noqa: F401
-
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from modules import io, metrics, preprocess, report, viz
 
+# 図を3つ続けて作成するため、初回描画時の準備（フォントの読み込みなど）を先に済ませる
+viz.warm_up_renderer()
+
 # %%[markdown]
 # ### データの読み込みと前処理
 # - Excelファイルから財務データを読み込む
@@ -74,7 +75,7 @@ df = metrics.normalize_percentage_columns(df, ["ROA", "ROE"])
 # %%
 # 欠損値の確認と処理
 df = preprocess.handle_missing(df, strategy="warn", subset=required_cols)
-print(df.isna().sum())
+print(df[required_cols].isna().sum())
 
 # %%[markdown]
 # ### 財務指標の計算
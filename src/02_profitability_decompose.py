@@ -19,8 +19,8 @@
 import sys
 from pathlib import Path
 
-import japanize_matplotlib  # noqa: F401
 import matplotlib.pyplot as plt
+import numpy as np
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
@@ -28,6 +28,9 @@ sys.path.insert(0, str(project_root))
 
 from modules import io, metrics, preprocess, report, viz
 
+# pyplotで直接作成するグラフにもスタイル・日本語フォントを適用する
+viz.configure_matplotlib()
+
 # %%[markdown]
 # ### データの読み込みと前処理
 # - Excelファイルから財務データを読み込む
@@ -37,15 +40,16 @@ from modules import io, metrics, preprocess, report, viz
 # データファイルのパス
 data_path = project_root / "input" / "財務データ_製薬業界.xlsx"
 
+# 分析に使用する列（必須列のみを読み込む）
+required_cols = ["証券コード", "企業名", "売上高", "営業利益", "当期純利益"]
+
 # データ読み込み
-df = io.load_financial_xlsx(str(data_path))
+df = io.load_financial_xlsx(str(data_path), usecols=required_cols)
 
 print(f"読み込んだデータ: {df.shape}")
 
 # %%
 # 必須列の確認
-required_cols = ["証券コード", "企業名", "売上高", "営業利益", "当期純利益"]
-
 preprocess.validate_columns(df, required_cols)
 
 # %%
@@ -57,7 +61,7 @@ print(df.shape)
 # %%
 # 欠損値の確認
 df = preprocess.handle_missing(df, strategy="warn", subset=required_cols)
-print(df.isna().sum())
+print(df[required_cols].isna().sum())
 # %%[markdown]
 # ### 利益率の計算
 # - 営業利益率と当期純利益率を計算
@@ -124,21 +128,18 @@ fig, ax = plt.subplots(figsize=(10, 8))
 df_plot = df[["企業名", "営業利益率", "当期純利益率"]].dropna()
 ax.scatter(df_plot["営業利益率"], df_plot["当期純利益率"], alpha=0.6, s=100)
 
-# 45度線を追加
-max_val = max(df_plot["営業利益率"].max(), df_plot["当期純利益率"].max())
-min_val = min(df_plot["営業利益率"].min(), df_plot["当期純利益率"].min())
+# 45度線を追加（両軸の値を1つの配列として取り出し、最小値・最大値を求める）
+# 値が1つもない場合は、pandasのmin/maxと同じくNaNとして描画を続ける
+margin_values = df_plot[["営業利益率", "当期純利益率"]].to_numpy(dtype=float)
+if np.isnan(margin_values).all():
+    min_val = max_val = np.nan
+else:
+    min_val = np.nanmin(margin_values)
+    max_val = np.nanmax(margin_values)
 ax.plot([min_val, max_val], [min_val, max_val], "r--", alpha=0.5, label="45度線")
 
 # 企業名ラベル
-for _, row in df_plot.iterrows():
-    ax.annotate(
-        row["企業名"],
-        (row["営業利益率"], row["当期純利益率"]),
-        xytext=(5, 5),
-        textcoords="offset points",
-        fontsize=8,
-        alpha=0.7,
-    )
+viz.annotate_points(ax, df_plot, "営業利益率", "当期純利益率", "企業名")
 
 # ラベルとタイトル
 ax.set_xlabel("営業利益率（%）", fontsize=12)
@@ -148,10 +149,12 @@ ax.legend()
 ax.grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig(
-    project_root / "output" / "fig_02_opm_vs_npm.png", dpi=150, bbox_inches="tight"
+viz.save_figure(
+    fig,
+    str(project_root / "output" / "fig_02_opm_vs_npm.png"),
+    dpi=viz.output_dpi(),
 )
-plt.show()
+viz.show_or_close()
 
 print("散布図を保存しました: output/fig_02_opm_vs_npm.png")
 
@@ -258,7 +261,10 @@ metadata = report.create_analysis_metadata(
 )
 
 # データ品質レポート
-quality_report = report.create_data_quality_report(df, required_cols)
+# （必要な列のみを読み込んでいるため、列数はExcelの全列数ではなく使用列数として出力する）
+quality_report = report.create_data_quality_report(
+    df, required_cols, column_count_label="使用列数"
+)
 
 # 各指標の上位下位のフォーマット
 margin_gap_summary = report.format_top_bottom_summary(
@@ -19,8 +19,9 @@
 import sys
 from pathlib import Path
 
-import japanize_matplotlib  # noqa: F401
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
@@ -28,17 +29,21 @@ sys.path.insert(0, str(project_root))
 
 from modules import io, metrics, preprocess, report, viz
 
+# pyplotで直接作成するグラフにもスタイル・日本語フォントを適用する
+viz.configure_matplotlib()
+
 # %%[markdown]
 # ### データの読み込みと前処理
 # - Excelファイルから財務データを読み込む
-# - 数値列の型変換を行う
+# - 数値列の型変換、ROA/ROEのパーセント表記の正規化、財務指標の計算を行う
+#   （分析④と共通の前処理のため、結果はキャッシュされる）
 
 # %%
 # データファイルのパス
 data_path = project_root / "input" / "財務データ_製薬業界.xlsx"
 
-# データ読み込み
-df = io.load_financial_xlsx(str(data_path))
+# データ読み込み・前処理
+df = preprocess.prepare_financial_data(str(data_path))
 
 print(f"読み込んだデータ: {df.shape}")
 
@@ -48,29 +53,16 @@ required_cols = ["証券コード", "企業名", "売上高", "総資産", "自
 
 preprocess.validate_columns(df, required_cols)
 
-# %%
-# 数値列の型変換
-numeric_cols = ["売上高", "総資産", "自己資本", "ROA", "ROE"]
-df = preprocess.coerce_numeric(df, numeric_cols)
-
-# %%
-# ROA/ROEがパーセント表記かどうかを確認して正規化
-df = metrics.normalize_percentage_columns(df, ["ROA", "ROE"])
-
 # %%
 # 欠損値の確認
 df = preprocess.handle_missing(df, strategy="warn", subset=required_cols)
-print(df.isna().sum())
+print(df[required_cols].isna().sum())
 
 # %%[markdown]
-# ### 財務指標の計算
-# - 自己資本比率、総資産回転率、ROE-ROA差分を計算
+# ### 財務指標の確認
+# - 自己資本比率、総資産回転率、ROE-ROA差分（前処理で計算済み）
 
 # %%
-# 財務指標を追加
-print(df.shape)
-df = metrics.add_financial_ratios(df)
-
 # 資本効率関連の列を確認
 capital_cols = ["自己資本比率", "総資産回転率", "ROE_ROA_gap"]
 print("\n資本効率関連の指標:")
@@ -110,7 +102,7 @@ fig, ax = plt.subplots(figsize=(10, 8))
 
 # データのプロット
 df_plot = df[["企業名", "ROA", "ROE"]].dropna()
-ax.scatter(df_plot["ROA"], df_plot["ROE"], alpha=0.6, s=100)
+viz.plot_uniform_markers(ax, df_plot["ROA"], df_plot["ROE"], alpha=0.6)
 
 # 45度線を追加（ROE = ROAの線）
 max_val = max(df_plot["ROA"].max(), df_plot["ROE"].max())
@@ -118,15 +110,7 @@ min_val = min(df_plot["ROA"].min(), df_plot["ROE"].min())
 ax.plot([min_val, max_val], [min_val, max_val], "r--", alpha=0.5, label="ROE = ROA")
 
 # 企業名ラベル
-for _, row in df_plot.iterrows():
-    ax.annotate(
-        row["企業名"],
-        (row["ROA"], row["ROE"]),
-        xytext=(5, 5),
-        textcoords="offset points",
-        fontsize=8,
-        alpha=0.7,
-    )
+viz.annotate_points(ax, df_plot, "ROA", "ROE", "企業名")
 
 # ラベルとタイトル
 ax.set_xlabel("ROA（%）", fontsize=12)
@@ -136,10 +120,12 @@ ax.legend()
 ax.grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig(
-    project_root / "output" / "fig_03_roa_vs_roe.png", dpi=150, bbox_inches="tight"
+viz.save_figure(
+    fig,
+    str(project_root / "output" / "fig_03_roa_vs_roe.png"),
+    dpi=viz.output_dpi(),
 )
-plt.show()
+viz.show_or_close()
 
 print("散布図を保存しました: output/fig_03_roa_vs_roe.png")
 
@@ -183,9 +169,8 @@ viz.create_scatter_plot(
 # - ROA ≈ 当期純利益率 × 総資産回転率
 
 # %%
-# 当期純利益率がない場合は計算
-if "当期純利益率" not in df.columns:
-    df = metrics.add_financial_ratios(df)
+# 当期純利益率はprepare_financial_dataの財務指標の追加で計算済み
+assert "当期純利益率" in df.columns, "prepare_financial_dataで当期純利益率が計算されていません"
 
 viz.create_scatter_plot(
     df=df,
@@ -212,21 +197,34 @@ print(f"\nROA中央値: {roa_median:.2f}%")
 print(f"ROE中央値: {roe_median:.2f}%")
 
 # 象限分類
-df["象限"] = "その他"
-df.loc[(df["ROA"] >= roa_median) & (df["ROE"] >= roe_median), "象限"] = "高ROA・高ROE"
-df.loc[(df["ROA"] >= roa_median) & (df["ROE"] < roe_median), "象限"] = "高ROA・低ROE"
-df.loc[(df["ROA"] < roa_median) & (df["ROE"] >= roe_median), "象限"] = "低ROA・高ROE"
-df.loc[(df["ROA"] < roa_median) & (df["ROE"] < roe_median), "象限"] = "低ROA・低ROE"
+# NaNの企業はどの比較もFalseになり「その他」に残るよう、高低の両方を明示的に判定する
+roa = df["ROA"].to_numpy(dtype=float, na_value=np.nan)
+roe = df["ROE"].to_numpy(dtype=float, na_value=np.nan)
+roa_hi, roa_lo = roa >= roa_median, roa < roa_median
+roe_hi, roe_lo = roe >= roe_median, roe < roe_median
+quadrant_labels = ["高ROA・高ROE", "高ROA・低ROE", "低ROA・高ROE", "低ROA・低ROE"]
+quadrant_values = np.select(
+    [roa_hi & roe_hi, roa_hi & roe_lo, roa_lo & roe_hi, roa_lo & roe_lo],
+    quadrant_labels,
+    default="その他",
+)
+df["象限"] = pd.Categorical(quadrant_values, categories=[*quadrant_labels, "その他"])
 
-# 象限別の企業数
+# 象限別の企業数（該当企業のない象限は表示しない）
 quadrant_counts = df["象限"].value_counts()
+quadrant_counts = quadrant_counts[quadrant_counts > 0]
 print("\n象限別の企業数:")
 print(quadrant_counts)
 
-# 各象限の企業リスト
+# 各象限の企業リスト（象限ごとの企業名のリストを一度のgroupbyで作成し、サマリーでも使う）
+quadrant_companies = {
+    quadrant: names.tolist()
+    for quadrant, names in df.groupby("象限", observed=True)["企業名"]
+}
+
 print("\n=== 象限別企業リスト ===")
-for quadrant in ["高ROA・高ROE", "高ROA・低ROE", "低ROA・高ROE", "低ROA・低ROE"]:
-    companies = df[df["象限"] == quadrant]["企業名"].tolist()
+for quadrant in quadrant_labels:
+    companies = quadrant_companies.get(quadrant, [])
     if companies:
         print(f"\n{quadrant}:")
         for company in companies:
@@ -237,8 +235,13 @@ for quadrant in ["高ROA・高ROE", "高ROA・低ROE", "低ROA・高ROE", "低RO
 # - ROA、ROE、自己資本比率、ROE-ROA差分の上位・下位を特定
 
 # %%
+# 4指標の上位・下位をまとめて取得
+top_bottom = metrics.get_top_bottom_batch(
+    df, ["ROA", "ROE", "自己資本比率", "ROE_ROA_gap"], n=3
+)
+
 # ROAの上位・下位
-roa_top_bottom = metrics.get_top_bottom_companies(df, "ROA", n=3)
+roa_top_bottom = top_bottom["ROA"]
 print("\n=== ROA 上位3社 ===")
 for company, value in roa_top_bottom["top"]:
     print(f"  {company}: {value:.2f}%")
@@ -249,7 +252,7 @@ for company, value in roa_top_bottom["bottom"]:
 
 # %%
 # ROEの上位・下位
-roe_top_bottom = metrics.get_top_bottom_companies(df, "ROE", n=3)
+roe_top_bottom = top_bottom["ROE"]
 print("\n=== ROE 上位3社 ===")
 for company, value in roe_top_bottom["top"]:
     print(f"  {company}: {value:.2f}%")
@@ -260,7 +263,7 @@ for company, value in roe_top_bottom["bottom"]:
 
 # %%
 # 自己資本比率の上位・下位
-equity_top_bottom = metrics.get_top_bottom_companies(df, "自己資本比率", n=3)
+equity_top_bottom = top_bottom["自己資本比率"]
 print("\n=== 自己資本比率 上位3社 ===")
 for company, value in equity_top_bottom["top"]:
     print(f"  {company}: {value:.2f}%")
@@ -271,7 +274,7 @@ for company, value in equity_top_bottom["bottom"]:
 
 # %%
 # ROE-ROA差分の上位・下位
-gap_top_bottom = metrics.get_top_bottom_companies(df, "ROE_ROA_gap", n=3)
+gap_top_bottom = top_bottom["ROE_ROA_gap"]
 print("\n=== ROE-ROA差分 上位3社（レバレッジ効果大）===")
 for company, value in gap_top_bottom["top"]:
     print(f"  {company}: {value:.2f}")
@@ -364,8 +367,8 @@ gap_summary = report.format_top_bottom_summary(gap_top_bottom, "ROE-ROA差分")
 
 # 象限別企業リスト
 quadrant_summary = []
-for quadrant in ["高ROA・高ROE", "高ROA・低ROE", "低ROA・高ROE", "低ROA・低ROE"]:
-    companies = df[df["象限"] == quadrant]["企業名"].tolist()
+for quadrant in quadrant_labels:
+    companies = quadrant_companies.get(quadrant, [])
     if companies:
         quadrant_summary.append(f"#### {quadrant}")
         for company in companies:
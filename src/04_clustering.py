@@ -19,32 +19,33 @@
 import sys
 from pathlib import Path
 
-import japanize_matplotlib  # noqa: F401
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
 import numpy as np
 import pandas as pd
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score
-from sklearn.preprocessing import StandardScaler
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from modules import io, metrics, preprocess, report
+from modules import io, preprocess, report, viz
 
 # %%[markdown]
 # ### データの読み込みと前処理
 # - Excelファイルから財務データを読み込む
-# - 数値列の型変換を行う
+# - 数値列の型変換、ROA/ROEのパーセント表記の正規化、財務指標の計算を行う
+#   （分析③と共通の前処理のため、結果はキャッシュされる）
 
 # %%
 # データファイルのパス
 data_path = project_root / "input" / "財務データ_製薬業界.xlsx"
 
-# データ読み込み
-df = io.load_financial_xlsx(str(data_path))
+# データ読み込み・前処理
+df = preprocess.prepare_financial_data(str(data_path))
 
 print(f"読み込んだデータ: {df.shape}")
 
@@ -65,19 +66,7 @@ required_cols = [
 preprocess.validate_columns(df, required_cols)
 
 # %%
-# 数値列の型変換
-numeric_cols = ["売上高", "営業利益", "当期純利益", "総資産", "自己資本", "ROA", "ROE"]
-df = preprocess.coerce_numeric(df, numeric_cols)
-
-# %%
-# ROA/ROEがパーセント表記かどうかを確認して正規化
-df = metrics.normalize_percentage_columns(df, ["ROA", "ROE"])
-
-# %%
-print(df.shape)
-# 財務指標を追加
-df = metrics.add_financial_ratios(df)
-
+# 前処理で追加された指標を確認
 print("\n追加された指標:")
 new_cols = ["営業利益率", "当期純利益率", "自己資本比率", "総資産回転率"]
 for col in new_cols:
@@ -107,20 +96,24 @@ clustering_cols = [
     "自己資本比率",
 ]
 
-# 売上高の対数変換
-df["売上高_log"] = np.log10(df["売上高"])
+# 売上高の対数変換（float64の配列に一度だけ変換し、NumPyで直接計算する）
+df["売上高_log"] = np.log10(df["売上高"].to_numpy(dtype=np.float64, na_value=np.nan))
 
 # 欠損値を含む行を除外（クラスタリング対象外）
 df_cluster = df[["企業名"] + clustering_cols].dropna()
 
 print(f"\nクラスタリング対象企業数: {len(df_cluster)}社")
 print(f"除外された企業数: {len(df) - len(df_cluster)}社")
-print(df.isna().sum())
+print(df[clustering_cols].isna().sum())
 # %%
 # 標準化（z-score）
-scaler = StandardScaler()
-X = df_cluster[clustering_cols].values
-X_scaled = scaler.fit_transform(X)
+# 企業数×指標数の小さな行列のため、sklearnのStandardScaler（入力検証・コピーを伴う）ではなく
+# NumPyで直接計算する（結果は同じ。分散が0の列はStandardScalerと同様にスケールを1とする）
+X = df_cluster[clustering_cols].to_numpy(dtype=np.float64)
+X_mean = X.mean(axis=0)
+X_std = X.std(axis=0)
+X_std[X_std == 0] = 1.0
+X_scaled = (X - X_mean) / X_std
 
 print(f"\n標準化後のデータ形状: {X_scaled.shape}")
 
@@ -130,14 +123,18 @@ print(f"\n標準化後のデータ形状: {X_scaled.shape}")
 
 # %%
 # k=2〜4でシルエットスコアを計算
+# 各kの学習済みモデルは保持し、最適なkで学習し直さずにそのまま使う
+# （低次元の密なデータのため、三角不等式で距離計算を省略できるelkan法を使う）
 silhouette_scores = {}
+kmeans_models = {}
 
 print("\n=== シルエットスコア ===")
 for k in range(2, 5):
-    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10, algorithm="elkan")
     labels = kmeans.fit_predict(X_scaled)
     score = silhouette_score(X_scaled, labels)
     silhouette_scores[k] = score
+    kmeans_models[k] = kmeans
     print(f"k={k}: {score:.4f}")
 
 # 最適なクラスター数を選択（シルエットスコアが最大のもの）
@@ -146,12 +143,12 @@ print(f"\n最適なクラスター数: k={optimal_k}")
 
 # %%[markdown]
 # ### k-meansクラスタリングの実行
-# - 最適なクラスター数でクラスタリングを実行
+# - 最適なクラスター数でのクラスタリング結果を使用
 
 # %%
-# 最適なkでクラスタリング
-kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-df_cluster["クラスター"] = kmeans.fit_predict(X_scaled)
+# 最適なkのクラスタリング結果（シルエットスコアの計算時に学習済み）
+kmeans = kmeans_models[optimal_k]
+df_cluster["クラスター"] = kmeans.labels_
 
 # クラスター番号を1始まりに変更
 df_cluster["クラスター"] = df_cluster["クラスター"] + 1
@@ -161,10 +158,14 @@ print("\nクラスター別企業数:")
 print(df_cluster["クラスター"].value_counts().sort_index())
 
 # %%
-# 各クラスターの企業リスト
+# 各クラスターの企業リスト（クラスター番号順に一度のgroupbyで作成し、サマリーでも使う）
+cluster_companies = {
+    cluster_id: names.tolist()
+    for cluster_id, names in df_cluster.groupby("クラスター")["企業名"]
+}
+
 print("\n=== クラスター別企業リスト ===")
-for cluster_id in sorted(df_cluster["クラスター"].unique()):
-    companies = df_cluster[df_cluster["クラスター"] == cluster_id]["企業名"].tolist()
+for cluster_id, companies in cluster_companies.items():
     print(f"\nクラスター{cluster_id}（{len(companies)}社）:")
     for company in companies:
         print(f"  - {company}")
@@ -173,6 +174,9 @@ for cluster_id in sorted(df_cluster["クラスター"].unique()):
 # 元のデータフレームにクラスター情報をマージ
 print(df.shape)
 df = df.merge(df_cluster[["企業名", "クラスター"]], on="企業名", how="left")
+# クラスタリング対象外の企業は欠損になるため、floatに昇格させず整数のまま保持する
+# （整数キーでのgroupbyの方が速く、出力でも「1.0」ではなく「1」と表示される）
+df["クラスター"] = df["クラスター"].astype("Int8")
 print(df.shape)
 # %%[markdown]
 # ### PCAによる2次元可視化
@@ -193,26 +197,22 @@ print(f"累積寄与率: {pca.explained_variance_ratio_.sum():.4f}")
 fig, ax = plt.subplots(figsize=(12, 8))
 
 # クラスターごとに色分け
-for cluster_id in sorted(df_cluster["クラスター"].unique()):
-    mask = df_cluster["クラスター"] == cluster_id
-    ax.scatter(
+cluster_labels = df_cluster["クラスター"].to_numpy()
+for cluster_id in cluster_companies:
+    mask = cluster_labels == cluster_id
+    viz.plot_uniform_markers(
+        ax,
         X_pca[mask, 0],
         X_pca[mask, 1],
-        label=f"クラスター{cluster_id}",
         alpha=0.7,
-        s=100,
+        label=f"クラスター{cluster_id}",
     )
 
-# 企業名ラベル
-for i, company in enumerate(df_cluster["企業名"]):
-    ax.annotate(
-        company,
-        (X_pca[i, 0], X_pca[i, 1]),
-        xytext=(5, 5),
-        textcoords="offset points",
-        fontsize=8,
-        alpha=0.7,
-    )
+# 企業名ラベル（主成分得点を企業名と同じデータフレームにまとめて渡す）
+df_pca = df_cluster[["企業名", "クラスター"]].assign(
+    第1主成分=X_pca[:, 0], 第2主成分=X_pca[:, 1]
+)
+viz.annotate_points(ax, df_pca, "第1主成分", "第2主成分", "企業名")
 
 # ラベルとタイトル
 ax.set_xlabel(
@@ -226,10 +226,12 @@ ax.legend()
 ax.grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig(
-    project_root / "output" / "fig_04_pca_clusters.png", dpi=150, bbox_inches="tight"
+viz.save_figure(
+    fig,
+    str(project_root / "output" / "fig_04_pca_clusters.png"),
+    dpi=viz.output_dpi(),
 )
-plt.show()
+viz.show_or_close()
 
 print("PCA散布図を保存しました: output/fig_04_pca_clusters.png")
 
@@ -253,7 +255,7 @@ cluster_profile = df.groupby("クラスター")[
         "自己資本比率",
         "総資産回転率",
     ]
-].mean()
+].mean(numeric_only=True)
 
 print("\n=== クラスター別プロファイル（平均値）===")
 print(cluster_profile.round(2))
@@ -281,19 +283,19 @@ profile_cols = [
 
 # クラスター別の平均値（元のdfを使用、欠損値を除外）
 cluster_profile_scaled = (
-    df.dropna(subset=["クラスター"]).groupby("クラスター")[profile_cols].mean()
+    df.dropna(subset=["クラスター"])
+    .groupby("クラスター")[profile_cols]
+    .mean(numeric_only=True)
 )
 
-# 標準化（各列を0-1にスケール）
-for col in profile_cols:
-    col_min = cluster_profile_scaled[col].min()
-    col_max = cluster_profile_scaled[col].max()
-    if col_max > col_min:
-        cluster_profile_scaled[col] = (cluster_profile_scaled[col] - col_min) / (
-            col_max - col_min
-        )
-    else:
-        cluster_profile_scaled[col] = 0.5
+# 標準化（各列を0-1にスケール。全列をまとめて計算する）
+profile_min = cluster_profile_scaled.min()
+profile_range = cluster_profile_scaled.max() - profile_min
+cluster_profile_scaled = (cluster_profile_scaled - profile_min) / profile_range
+
+# 全クラスターで値が同じ列（範囲が0または欠損）は0.5とする
+is_flat = ~(profile_range > 0).to_numpy(dtype=bool, na_value=False)
+cluster_profile_scaled.loc[:, is_flat] = 0.5
 
 # %%
 # レーダーチャートの作成
@@ -304,13 +306,45 @@ ax = fig.add_subplot(111, projection="polar")
 angles = np.linspace(0, 2 * np.pi, len(profile_cols), endpoint=False).tolist()
 angles += angles[:1]  # 最初の点に戻る
 
-# クラスターごとにプロット
-for cluster_id in sorted(cluster_profile_scaled.index):
-    values = cluster_profile_scaled.loc[cluster_id].tolist()
-    values += values[:1]  # 最初の点に戻る
+# 全クラスターの頂点を(クラスター数, 頂点数, 2)の配列にまとめる
+radar_cluster_ids = sorted(cluster_profile_scaled.index)
+radar_values = cluster_profile_scaled.loc[radar_cluster_ids].to_numpy(
+    dtype=np.float64, na_value=np.nan
+)
+radar_values = np.column_stack([radar_values, radar_values[:, :1]])  # 最初の点に戻る
+radar_verts = np.stack(
+    [np.broadcast_to(angles, radar_values.shape), radar_values], axis=-1
+)
+radar_colors = [f"C{i}" for i in range(len(radar_cluster_ids))]
+
+# クラスターごとの塗りつぶし・線・点を、それぞれ1つのコレクションとしてまとめて描画する
+# （描画順はax.fill → ax.plotと同じく、塗りつぶしの上に線と点を重ねる）
+ax.add_collection(
+    PolyCollection(
+        radar_verts,
+        facecolors=radar_colors,
+        edgecolors="none",
+        alpha=0.15,
+        rasterized=True,
+    )
+)
+ax.add_collection(
+    LineCollection(radar_verts, colors=radar_colors, linewidths=2, rasterized=True)
+)
+ax.scatter(
+    radar_verts[:, :-1, 0].ravel(),
+    radar_verts[:, :-1, 1].ravel(),
+    c=np.repeat(radar_colors, len(profile_cols)),
+    s=plt.rcParams["lines.markersize"] ** 2,
+    zorder=2,
+    rasterized=True,
+)
 
-    ax.plot(angles, values, "o-", linewidth=2, label=f"クラスター{cluster_id}")
-    ax.fill(angles, values, alpha=0.15)
+# 凡例は各クラスターの線と点を表す代理の図形で作成する
+radar_handles = [
+    Line2D([], [], color=color, marker="o", linewidth=2, label=f"クラスター{cluster_id}")
+    for cluster_id, color in zip(radar_cluster_ids, radar_colors)
+]
 
 # ラベルの設定
 ax.set_xticks(angles[:-1])
@@ -319,14 +353,18 @@ ax.set_ylim(0, 1)
 ax.set_title(
     "クラスター別プロファイル（正規化済み）", fontsize=14, fontweight="bold", pad=20
 )
-ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1))
+ax.legend(handles=radar_handles, loc="upper right", bbox_to_anchor=(1.3, 1.1))
 ax.grid(True)
 
 plt.tight_layout()
-plt.savefig(
-    project_root / "output" / "fig_04_cluster_profile.png", dpi=150, bbox_inches="tight"
+# 凡例を図の外側に配置しているため、bbox_inches="tight"で図の範囲を広げて保存する
+viz.save_figure(
+    fig,
+    str(project_root / "output" / "fig_04_cluster_profile.png"),
+    dpi=viz.output_dpi(),
+    bbox_inches="tight",
 )
-plt.show()
+viz.show_or_close()
 
 print("レーダーチャートを保存しました: output/fig_04_cluster_profile.png")
 
@@ -368,16 +406,23 @@ io.save_table(
 # クラスター別の特徴を抽出
 cluster_interpretations = []
 
-for cluster_id in sorted(df_cluster["クラスター"].unique()):
-    cluster_data = df[df["クラスター"] == cluster_id]
-    n_companies = len(cluster_data)
-
-    # 平均値
-    avg_sales = cluster_data["売上高"].mean()
-    avg_roa = cluster_data["ROA"].mean()
-    avg_roe = cluster_data["ROE"].mean()
-    avg_opm = cluster_data["営業利益率"].mean()
-    avg_equity_ratio = cluster_data["自己資本比率"].mean()
+# クラスター別の企業数と平均値（全クラスター分を一度のgroupbyで集計する）
+cluster_groups = df.groupby("クラスター")
+cluster_sizes = cluster_groups.size()
+cluster_means = cluster_groups[
+    ["売上高", "ROA", "ROE", "営業利益率", "自己資本比率"]
+].mean(numeric_only=True)
+
+# 行ごとのSeriesを作らないよう、平均値はタプルとして取り出す（列の順序は上の指定順）
+for (
+    cluster_id,
+    avg_sales,
+    avg_roa,
+    avg_roe,
+    avg_opm,
+    avg_equity_ratio,
+) in cluster_means.itertuples(name=None):
+    n_companies = int(cluster_sizes[cluster_id])
 
     interpretation = {
         "クラスター": f"クラスター{cluster_id}",
@@ -464,8 +509,7 @@ quality_report = report.create_data_quality_report(df, required_cols)
 
 # クラスター別企業リスト
 cluster_summary = []
-for cluster_id in sorted(df_cluster["クラスター"].unique()):
-    companies = df_cluster[df_cluster["クラスター"] == cluster_id]["企業名"].tolist()
+for cluster_id, companies in cluster_companies.items():
     cluster_summary.append(f"**クラスター{cluster_id}（{len(companies)}社）**")
     for company in companies:
         cluster_summary.append(f"{company}")